@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Compare the old per-option regex scans of the 'c:' line with the single
+# pass WbarCommand index.
+#
+# Usage: python3 benchmarks/bench_command.py [number of extra options ...]
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wbarconfig import WbarCommand
+
+FLAGS = ['--bpress', '--above-desk', '--vbar', '--nofont', '--grow',
+    '--noreload']
+VALUED = {'--pos': 'bottom', '--offset': '4', '--isize': '32',
+    '--idist': '5', '--nanim': '3', '--zoomf': '1.8', '--jumpf': '0.9',
+    '--dblclk': '250', '--balfa': '23', '--falfa': '84', '--filter': '1',
+    '--fc': '0xff00c800'}
+
+
+def makeCommand(extra):
+
+    parts = ['wbar']
+    parts.extend('--extra%d %d' % (i, i) for i in range(extra))
+    parts.extend(FLAGS)
+    parts.extend('%s %s' % item for item in VALUED.items())
+
+    return ' '.join(parts)
+
+
+def oldPath(cmd):
+
+    values = {}
+    for text in FLAGS:
+        values[text] = text in cmd
+
+    for text in VALUED:
+        if text in cmd:
+            value = re.sub('.*' + text + ' ', '', cmd)
+            values[text] = re.sub(' .*', '', value)
+
+    return values
+
+
+def newPath(cmd):
+
+    command = WbarCommand(cmd)
+
+    values = {}
+    for text in FLAGS:
+        values[text] = text in command
+
+    for text in VALUED:
+        if text in command:
+            values[text] = command.get(text)
+
+    return values
+
+
+def main():
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [0, 100, 300, 500]
+    number = 200
+
+    for extra in sizes:
+        cmd = makeCommand(extra)
+        assert newPath(cmd) == oldPath(cmd)
+
+        for name, func in (('old', oldPath), ('new', newPath)):
+            best = min(timeit.repeat(lambda: func(cmd), number = number,
+                repeat = 5))
+            print('%-4s %4d options: %8.1f us per load' % (name,
+                extra + len(FLAGS) + len(VALUED), best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Frame time of the dock preview with the raster paint engine: the pointer
+# sweeps along a dock of 256x256 icons drawn at --isize 48 with zoom, jump
+# and the color filter, and every frame is one animation step and one full
+# repaint into a QImage.
+#
+# Usage: python3 benchmarks/bench_dockpreview.py [number of icons ...]
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QColor, QPainter
+from dockpreview import DockPreview
+from wbarconfig import IconEntry
+
+OPTIONS = {'--isize': '48', '--idist': '5', '--nanim': '5', '--zoomf': '2.0',
+    '--jumpf': '0.9', '--balfa': '60', '--falfa': '84', '--filter': '1',
+    '--fc': '0x8000c800'}
+
+
+def makeIcons(direc, nicons):
+
+    icons = []
+    for i in range(nicons):
+        image = QImage(256, 256, QImage.Format_ARGB32)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setBrush(QColor.fromHsv(i * 37 % 360, 200, 230))
+        painter.drawEllipse(8, 8, 240, 240)
+        painter.end()
+
+        path = os.path.join(direc, 'icon%d.png' % i)
+        image.save(path)
+        icons.append(IconEntry(path, 'app%d' % i, 'Application %d' % i))
+
+    return icons
+
+
+def main():
+
+    app = QApplication(sys.argv[:1])
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ['XDG_CACHE_HOME'] = tmpdir
+        allIcons = makeIcons(tmpdir, max(sizes))
+
+        for nicons in sizes:
+            preview = DockPreview()
+            preview.setOptions(OPTIONS)
+            preview.setIcons(allIcons[:nicons])
+            preview.resize(preview.minimumSize())
+
+            # The icons are decoded once they are painted
+            frame = QImage(preview.size(), QImage.Format_ARGB32_Premultiplied)
+            painter = QPainter(frame)
+            preview.drawDock(painter)
+            painter.end()
+
+            while preview.loader.pendingPaths():
+                app.processEvents()
+
+            times = []
+            length = preview.width()
+            for x in list(range(0, length, 4)) * 2:
+                start = time.perf_counter()
+                preview._pointer = x
+                if x % 64 == 0:
+                    preview._jumps[preview.rowAt(x)] = time.perf_counter()
+                preview.step()
+                painter = QPainter(frame)
+                preview.drawDock(painter)
+                painter.end()
+                times.append(time.perf_counter() - start)
+
+            # The second sweep, with every sprite size made already
+            steady = times[len(times) // 2:]
+            mean = sum(steady) / len(steady)
+            print('%4d icons: mean %6.3f ms (%5.0f fps), worst %6.3f ms, '
+                'first sweep worst %6.3f ms, %d sprites' % (nicons,
+                mean * 1e3, 1 / mean, max(steady) * 1e3,
+                max(times[:len(times) // 2]) * 1e3, len(preview._sprites)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Per keystroke latency of the icon filter: IconFilterProxy (lowercase index,
+# narrowing on the previous matches) against a proxy that lowercases the
+# title and command of every row on every keystroke.
+#
+# Usage: python3 benchmarks/bench_filter.py [number of icons ...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QSortFilterProxyModel
+from iconmodel import IconTableModel, IconFilterProxy
+from wbarconfig import IconEntry
+
+
+class RescanProxy(QSortFilterProxyModel):
+
+    def __init__(self, *args, **kwargs):
+        super(RescanProxy, self).__init__(*args, **kwargs)
+        self.query = ''
+
+    def setFilterText(self, text):
+        self.query = text.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, row, parent):
+        entry = self.sourceModel().listIcons[row]
+        return (self.query in entry.title.lower() or
+            self.query in entry.command.lower())
+
+
+def makeIcons(nicons):
+
+    return [IconEntry('/usr/share/pixmaps/app%d.png' % i,
+        '/usr/bin/app%d --option' % i, 'Application %d' % i)
+        for i in range(nicons)]
+
+
+def shownRows(proxy):
+
+    return [proxy.mapToSource(proxy.index(row, 0)).row()
+        for row in range(proxy.rowCount())]
+
+
+def scanRows(listIcons, text):
+
+    query = text.lower()
+    return [row for row, entry in enumerate(listIcons)
+        if query in entry.title.lower() or query in entry.command.lower()]
+
+
+def typeQuery(proxy, query):
+    """Type the query one key at a time, then erase it. Return the worst
+    and the mean keystroke time. After each key the rows shown are checked
+    against a plain substring scan, outside the timing."""
+
+    texts = [query[:i] for i in range(1, len(query) + 1)]
+    texts += texts[-2::-1] + ['']
+
+    times = []
+    for text in texts:
+        start = time.perf_counter()
+        proxy.setFilterText(text)
+        proxy.rowCount()
+        times.append(time.perf_counter() - start)
+
+        expected = scanRows(proxy.sourceModel().listIcons, text)
+        if shownRows(proxy) != expected:
+            sys.exit('%s shows the wrong rows for %r' % (
+                type(proxy).__name__, text))
+
+    return max(times), sum(times) / len(times)
+
+
+def main():
+
+    app = QApplication(sys.argv[:1])
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    query = 'application 99'
+
+    # Ends with a text no row matches
+    queries = (query, query + 'x', 'app1 ', '--option')
+
+    for nicons in sizes:
+        model = IconTableModel(makeIcons(nicons))
+
+        for name, proxyClass in (('rescan', RescanProxy),
+                ('index', IconFilterProxy)):
+            proxy = proxyClass()
+            proxy.setSourceModel(model)
+            for text in queries:
+                worst, mean = typeQuery(proxy, text)
+                print('%-7s %6d icons %-16r mean %7.3f ms, worst %7.3f ms '
+                    'per key' % (name, nicons, text, mean * 1e3,
+                    worst * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Image preview of the file dialog, stepping through a directory of large
+# jpeg files: the decode of one preview, in full then scaled against
+# QImageReader.setScaledSize, and the time onChange blocks the GUI thread.
+#
+# Usage: python3 benchmarks/bench_preview.py [number of images]
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QColor, QLinearGradient, QPainter
+from filedialogpreview import ImageDialogPreview
+from thumbnailcache import ThumbnailCache
+
+
+def makeImages(direc, nimages, width = 4000, height = 3000):
+
+    paths = []
+    for i in range(nimages):
+        image = QImage(width, height, QImage.Format_RGB32)
+        painter = QPainter(image)
+        gradient = QLinearGradient(0, 0, width, height)
+        gradient.setColorAt(0, QColor.fromHsv(i * 37 % 360, 200, 250))
+        gradient.setColorAt(1, QColor.fromHsv(i * 91 % 360, 250, 80))
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+
+        path = os.path.join(direc, 'wallpaper%d.jpg' % i)
+        image.save(path, 'JPEG', 90)
+        paths.append(path)
+
+    return paths
+
+
+def timeDecodes(paths):
+
+    start = time.perf_counter()
+    for path in paths:
+        QImage(path).scaled(250, 250, Qt.KeepAspectRatio,
+            Qt.SmoothTransformation)
+    full = (time.perf_counter() - start) / len(paths)
+
+    start = time.perf_counter()
+    for path in paths:
+        ThumbnailCache._decode(path, 256)
+    scaled = (time.perf_counter() - start) / len(paths)
+
+    return full, scaled
+
+
+def timeOnChange(app, dialog, paths):
+    """Step forward and back through the paths twice, return the worst time
+    spent in onChange and the time until the last preview is shown."""
+
+    worst = 0
+    start = time.perf_counter()
+    for path in paths + paths[::-1] + paths + paths[::-1]:
+        t = time.perf_counter()
+        dialog.onChange(path)
+        worst = max(worst, time.perf_counter() - t)
+        app.processEvents()
+
+    while dialog.loader.pendingPaths():
+        app.processEvents()
+
+    return worst, time.perf_counter() - start
+
+
+def main():
+
+    app = QApplication(sys.argv[:1])
+    nimages = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = makeImages(tmpdir, nimages)
+
+        full, scaled = timeDecodes(paths)
+        print('decode one preview: full %8.1f ms, scaled %8.1f ms'
+            % (full * 1e3, scaled * 1e3))
+
+        # The dialog has a cache of its own, empty and not written to disk
+        dialog = ImageDialogPreview()
+        worst, total = timeOnChange(app, dialog, paths)
+        print('onChange: worst %8.3f ms on the GUI thread, %d steps in '
+            '%8.1f ms' % (worst * 1e3, 4 * nimages, total * 1e3))
+
+
+if __name__ == '__main__':
+    main()
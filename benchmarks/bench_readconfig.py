@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Time and peak memory of reading configs with 10k+ icon blocks: the old
+# dictionary based readConfig against the streaming wbarconfig parser.
+#
+# Usage: python3 benchmarks/bench_readconfig.py [number of icons ...]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wbarconfig
+
+
+def writeConfig(path, nicons):
+
+    with open(path, 'w') as fh:
+        fh.write('i: /usr/share/pixmaps/wbar/dock.png\n')
+        fh.write('c: wbar --bpress --pos bottom --isize 32 --zoomf 1.8\n')
+        fh.write('t: /usr/share/fonts/truetype/liberation/'
+            'LiberationMono-Regular/12\n\n')
+
+        for i in range(nicons):
+            fh.write('# launcher %d\n' % i)
+            fh.write('i: /usr/share/pixmaps/app%d.png\n' % i)
+            fh.write('c: /usr/bin/app%d --some-option\n' % i)
+            fh.write('t: Application %d\n\n' % i)
+
+
+def oldReadConfig(confFl):
+
+    # The readConfig of WbarDialog before the parser was split out
+    ilst = []
+    dct = None
+
+    with open(confFl, 'r') as fh:
+
+        for line in fh:
+            line = line.strip()
+
+            if line.startswith('#'):
+                continue
+
+            else:
+                if 'i: ' in line:
+                    dct = {}
+                    dct['icon'] = line.replace('i: ', '')
+
+                elif 'c: ' in line:
+                    dct['command'] = line.replace('c: ', '')
+
+                elif 't: ' in line:
+                    dct['title'] = line.replace('t: ', '')
+
+                else:
+                    if dct:
+                        ilst.append(dct)
+                        dct = None
+
+    wbConf = ilst.pop(0)
+
+    return wbConf, ilst
+
+
+def streamConfig(confFl):
+
+    # Process the entries one at a time without keeping them
+    n = 0
+    for entry in wbarconfig.iterConfig(confFl):
+        n += 1
+
+    return n
+
+
+def measure(func, path):
+
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+
+    # Memory in a second run, tracemalloc slows down the timing
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for nicons in sizes:
+            path = os.path.join(tmpdir, 'wbar-%d' % nicons)
+            writeConfig(path, nicons)
+
+            bar, icons = wbarconfig.readConfig(path)
+            assert len(icons) == nicons
+
+            for name, func in (('old readConfig', oldReadConfig),
+                               ('readConfig', wbarconfig.readConfig),
+                               ('iterConfig', streamConfig)):
+                elapsed, peak = measure(func, path)
+                print('%-15s %6d icons: %7.1f ms, peak %8.1f KiB' % (name,
+                    nicons, elapsed * 1e3, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Latency of writing a config in place (the old saveConfig) against the
+# atomic temporary file + fsync + rename path.
+#
+# Usage: python3 benchmarks/bench_save.py [number of icons ...]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wbarconfig import atomicWrite
+
+
+def makeText(nicons):
+
+    lines = ['i: /usr/share/pixmaps/wbar/dock.png',
+        'c: wbar --bpress --pos bottom --isize 32 --zoomf 1.8',
+        't: /usr/share/fonts/truetype/liberation/LiberationMono-Regular/12',
+        '']
+
+    for i in range(nicons):
+        lines.extend(['i: /usr/share/pixmaps/app%d.png' % i,
+            'c: /usr/bin/app%d' % i, 't: Application %d' % i, ''])
+
+    return '\n'.join(lines) + '\n'
+
+
+def inPlaceWrite(path, text, backups = 0):
+
+    fh = open(path, 'w')
+    for line in text.splitlines(True):
+        fh.write(line)
+    fh.close()
+
+
+def timeWrites(func, path, text, repeat, **kwargs):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path, text, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 1000, 10000]
+    repeat = 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, '.wbar')
+
+        for nicons in sizes:
+            text = makeText(nicons)
+
+            for name, func, kwargs in (
+                    ('in place', inPlaceWrite, {}),
+                    ('atomic', atomicWrite, {}),
+                    ('atomic+backup', atomicWrite, {'backups': 2})):
+                best = timeWrites(func, path, text, repeat, **kwargs)
+                print('%-14s %6d icons: %8.3f ms' % (name, nicons,
+                    best * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Startup time of wbar-settings, in fresh interpreters:
+#   - the imports of 'wbar-settings --help' and of a headless subcommand,
+#     read from -X importtime, which must not include PyQt5;
+#   - the time until the dialog is shown and until its icon list is filled,
+#     with the offscreen Qt platform.
+#
+# Usage: python3 benchmarks/bench_startup.py [--check] [--max-ms n] [icons]
+#
+# With --check the exit status is 1 if Qt is imported without a window or if
+# the dialog takes longer than --max-ms (default 2000) to show, for CI.
+
+import os
+import sys
+import json
+import subprocess
+import tempfile
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+script = os.path.join(repoDir, 'wbar-settings.py')
+
+# Run in the child: time the dialog up to the first paint and the loaded
+# config, and print the result as JSON.
+dialogProbe = r'''
+import os, sys, json, time
+start = time.perf_counter()
+sys.path.insert(0, %(repoDir)r)
+from PyQt5.QtWidgets import QApplication
+from wbardialog import WbarDialog
+imported = time.perf_counter()
+app = QApplication([])
+window = WbarDialog(%(config)r)
+window.show()
+while window.configPending:
+    app.processEvents()
+shown = time.perf_counter()
+while not window.configRead:
+    app.processEvents()
+loaded = time.perf_counter()
+print(json.dumps({'import': imported - start, 'shown': shown - start,
+    'loaded': loaded - start, 'rows': window.iconModel.rowCount()}))
+'''
+
+
+def makeConfig(path, nicons):
+
+    lines = ['i: /usr/share/pixmaps/wbar/dock.png',
+        'c: wbar --bpress --pos bottom --isize 32 --zoomf 1.8',
+        't: /usr/share/fonts/truetype/liberation/LiberationMono-Regular/12',
+        '']
+
+    for i in range(nicons):
+        lines.extend(['i: /usr/share/pixmaps/app%d.png' % i,
+            'c: /usr/bin/app%d' % i, 't: Application %d' % i, ''])
+
+    with open(path, 'w') as fh:
+        fh.write('\n'.join(lines) + '\n')
+
+
+def importTimes(args):
+    """Return (total seconds, module names) of the imports of a run."""
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime', script] + args,
+        stdout = subprocess.DEVNULL, stderr = subprocess.PIPE,
+        universal_newlines = True)
+
+    total = 0
+    modules = []
+    for line in proc.stderr.splitlines():
+        # 'import time: self [us] | cumulative | imported package'
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        fields = line[len('import time:'):].split('|')
+        modules.append(fields[2].strip())
+
+        # Only the top level imports, their cumulative time covers the rest
+        if not fields[2].startswith('  '):
+            total += int(fields[1])
+
+    return total / 1e6, modules
+
+
+def dialogTimes(config):
+
+    env = dict(os.environ, QT_QPA_PLATFORM = 'offscreen')
+    env.setdefault('XDG_RUNTIME_DIR', tempfile.gettempdir())
+
+    proc = subprocess.run([sys.executable, '-c', dialogProbe % {
+        'repoDir': repoDir, 'config': config}], env = env,
+        stdout = subprocess.PIPE, stderr = subprocess.DEVNULL,
+        universal_newlines = True, check = True)
+
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def main():
+
+    args = sys.argv[1:]
+    check = '--check' in args
+    maxMs = 2000
+    if '--max-ms' in args:
+        maxMs = float(args[args.index('--max-ms') + 1])
+        del args[args.index('--max-ms'):args.index('--max-ms') + 2]
+    sizes = [int(arg) for arg in args if arg.isdigit()] or [10, 1000]
+
+    failed = False
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = os.path.join(tmpdir, '.wbar')
+        makeConfig(config, 10)
+
+        for name, cliArgs in (('--help', ['--help']),
+                ('get', ['get', '-c', config])):
+            seconds, modules = importTimes(cliArgs)
+            qt = [m for m in modules if m.startswith('PyQt5')]
+            print('%-14s imports: %8.3f ms, %d modules, Qt %s' % (name,
+                seconds * 1e3, len(modules), 'loaded' if qt else 'not loaded'))
+            failed = failed or bool(qt)
+
+        for nicons in sizes:
+            makeConfig(config, nicons)
+            times = dialogTimes(config)
+            print('dialog %6d icons: import %8.3f ms, shown %8.3f ms, '
+                'filled %8.3f ms' % (times['rows'], times['import'] * 1e3,
+                times['shown'] * 1e3, times['loaded'] * 1e3))
+            failed = failed or times['shown'] * 1e3 > maxMs
+
+    if check and failed:
+        print('startup check failed')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
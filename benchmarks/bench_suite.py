@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# The regression suite: the main paths of WbarDialog on synthetic configs,
+# with the offscreen Qt platform, against the baselines stored in
+# benchmarks/baselines.json. The configs are
+#   small, 1k, 50k    10, 1000 and 50000 icons of a few small images
+#   long-commands     1000 icons with command lines of about 4 KiB
+#   missing-icons     1000 icons whose image files do not exist
+#   huge-images       20 icons of 4096x4096 images
+# and the paths timed in each of them are
+#   readConfig    parsing the file into the ConfigDocument
+#   updateTable   handing the icon list over to the table model
+#   reload        filling the Preferences and Effects tabs from the config
+#   getCommand    building the wbar command line from the tabs
+#   saveConfig    saving the config with one icon changed (ConfigDocument
+#                 rewrites the changed blocks only)
+#   thumbnails    decoding the thumbnails of the visible rows, cold caches
+# Each time is the best of --repeat runs, in ms, as the fsync of a save and
+# the thread pool make single runs noisy.
+#
+# Usage: python3 benchmarks/bench_suite.py [--check] [--update]
+#            [--threshold r] [--repeat n] [scenario ...]
+#
+# With --check the exit status is 1 if a time is more than threshold
+# (default 0.5, i.e. 50%) over its baseline, and more than 5 ms over it so
+# that the noise of the short paths is ignored, for CI. --update stores the
+# times of this run as the new baselines. The baselines depend on the
+# machine: store them again on the machine the checks run on.
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QColor, QPainter
+
+baselinesFile = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    'baselines.json')
+
+# name -> (number of icons, kind of config)
+SCENARIOS = (
+    ('small', 10, 'plain'),
+    ('1k', 1000, 'plain'),
+    ('50k', 50000, 'plain'),
+    ('long-commands', 1000, 'long-commands'),
+    ('missing-icons', 1000, 'missing-icons'),
+    ('huge-images', 20, 'huge-images'),
+)
+
+OPERATIONS = ('readConfig', 'updateTable', 'reload', 'getCommand',
+    'saveConfig', 'thumbnails')
+
+# Every option of the dialog set, so that reload and getCommand go through
+# all the widgets
+BAR_COMMAND = ('wbar --bpress --above-desk --pos bottom --offset 4 '
+    '--isize 48 --idist 5 --nanim 5 --zoomf 1.8 --jumpf 0.9 --dblclk 250 '
+    '--balfa 60 --falfa 84 --filter 1 --fc 0xff00c800')
+
+# Regressions smaller than this are noise whatever the ratio
+minSlowdownMs = 5.0
+
+
+def makeImage(path, size, hue):
+
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setBrush(QColor.fromHsv(hue % 360, 200, 230))
+    painter.drawEllipse(size // 32, size // 32, size - size // 16,
+        size - size // 16)
+    painter.end()
+    image.save(path)
+
+
+def makeImages(direc, count, size):
+
+    paths = []
+    for i in range(count):
+        path = os.path.join(direc, 'icon-%d-%d.png' % (size, i))
+        if not os.path.exists(path):
+            makeImage(path, size, i * 37)
+        paths.append(path)
+
+    return paths
+
+
+def makeConfig(path, nicons, kind, imageDir):
+
+    if kind == 'huge-images':
+        images = makeImages(imageDir, 4, 4096)
+    elif kind == 'missing-icons':
+        images = [os.path.join(imageDir, 'missing', 'app%d.png' % i)
+            for i in range(nicons)]
+    else:
+        images = makeImages(imageDir, 64, 48)
+
+    barImage = makeImages(imageDir, 1, 64)[0]
+
+    lines = ['i: %s' % barImage, 'c: %s' % BAR_COMMAND,
+        't: /usr/share/fonts/truetype/liberation/LiberationMono-Regular/12',
+        '']
+
+    for i in range(nicons):
+        if kind == 'long-commands':
+            command = 'sh -c "%s"' % ' && '.join('/usr/bin/step%d '
+                '--input \'/home/user/data/file %d.txt\' --verbose' % (j, j)
+                for j in range(60))
+        else:
+            command = '/usr/bin/app%d' % i
+
+        lines.extend(['# launcher %d' % i, 'i: %s' % images[i % len(images)],
+            'c: %s' % command, 't: Application %d' % i, ''])
+
+    with open(path, 'w') as fh:
+        fh.write('\n'.join(lines) + '\n')
+
+
+def best(func, repeat, setup = None):
+
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return min(times) * 1e3
+
+
+class Suite(object):
+
+    def __init__(self, app, workDir, repeat):
+
+        self.app = app
+        self.workDir = workDir
+        self.repeat = repeat
+        self.imageDir = os.path.join(workDir, 'images')
+        os.makedirs(self.imageDir)
+
+    def run(self, name, nicons, kind):
+
+        from wbardialog import WbarDialog
+        from thumbnailcache import ThumbnailCache
+        from wbarconfig import WbarCommand, IconEntry
+
+        path = os.path.join(self.workDir, '%s.wbar' % name)
+        makeConfig(path, nicons, kind, self.imageDir)
+
+        window = WbarDialog(path)
+        window.resize(800, 600)
+        window.show()
+
+        # Paint once without loading the config, it is read below
+        window.configPending = False
+        self.app.processEvents()
+        window.ensureTabs()
+
+        times = {}
+
+        times['readConfig'] = best(lambda: window.readConfig(path),
+            self.repeat)
+        barSettings, listIcons = window.readConfig(path)
+
+        def updateTable():
+            window.listIcons = listIcons
+            window.updateTable()
+
+        times['updateTable'] = best(updateTable, self.repeat)
+
+        def reload():
+            window.barSettings = barSettings
+            window.wbarCommand = WbarCommand(barSettings.command)
+            window.updateWbarConfig()
+            window.updatePreferences()
+            window.updateEffects()
+
+        times['reload'] = best(reload, self.repeat)
+        window.configRead = True
+
+        times['getCommand'] = best(window.getCommand, self.repeat)
+
+        last = listIcons[-1]
+        edits = [IconEntry(last.icon, last.command, last.title + ' *'), last]
+
+        def changeIcon():
+            listIcons[-1] = edits[0]
+            edits.reverse()
+
+        times['saveConfig'] = best(window.saveConfig, self.repeat,
+            changeIcon)
+
+        # A new cache with an empty thumbnail directory for each run
+        delegate = window.iconDelegate
+        runs = []
+
+        def coldCaches():
+            thumbnailDir = os.path.join(self.workDir, 'thumbnails-%d' %
+                len(runs))
+            runs.append(thumbnailDir)
+            delegate.loader.cache = ThumbnailCache(thumbnailDir =
+                thumbnailDir)
+            delegate._pixmaps.clear()
+
+        def thumbnails():
+            window.iconTable.viewport().repaint()
+            while delegate.loader.pendingPaths():
+                self.app.processEvents()
+                delegate.loader.pool.waitForDone(1)
+            self.app.processEvents()
+
+        times['thumbnails'] = best(thumbnails, self.repeat, coldCaches)
+
+        for thumbnailDir in runs:
+            shutil.rmtree(thumbnailDir, ignore_errors = True)
+
+        window.hide()
+        window.deleteLater()
+        self.app.processEvents()
+
+        return times
+
+
+def loadBaselines():
+
+    try:
+        with open(baselinesFile, 'r') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def saveBaselines(results, threshold):
+
+    baselines = loadBaselines()
+    scenarios = baselines.get('scenarios', {})
+    for name, times in results.items():
+        scenarios[name] = dict((op, round(ms, 3)) for op, ms in times.items())
+
+    with open(baselinesFile, 'w') as fh:
+        json.dump({'threshold': threshold, 'scenarios': scenarios}, fh,
+            indent = 2, sort_keys = True)
+        fh.write('\n')
+
+
+def main():
+
+    args = sys.argv[1:]
+    check = '--check' in args
+    update = '--update' in args
+    baselines = loadBaselines()
+    threshold = baselines.get('threshold', 0.5)
+    repeat = 5
+
+    for option in ('--threshold', '--repeat'):
+        if option in args:
+            pos = args.index(option)
+            if option == '--threshold':
+                threshold = float(args[pos + 1])
+            else:
+                repeat = int(args[pos + 1])
+            del args[pos:pos + 2]
+
+    names = [arg for arg in args if not arg.startswith('--')]
+    unknown = set(names) - set(name for name, nicons, kind in SCENARIOS)
+    if unknown:
+        sys.exit('unknown scenario: %s' % ', '.join(sorted(unknown)))
+
+    app = QApplication([])
+    results = {}
+    regressions = []
+
+    with tempfile.TemporaryDirectory() as workDir:
+        # Keep the thumbnails and the indexes of the run out of ~/.cache
+        os.environ['XDG_CACHE_HOME'] = os.path.join(workDir, 'cache')
+        os.environ.setdefault('XDG_RUNTIME_DIR', workDir)
+
+        suite = Suite(app, workDir, repeat)
+
+        for name, nicons, kind in SCENARIOS:
+            if names and name not in names:
+                continue
+
+            times = results[name] = suite.run(name, nicons, kind)
+            baseline = baselines.get('scenarios', {}).get(name, {})
+
+            for op in OPERATIONS:
+                ms = times[op]
+                base = baseline.get(op)
+                line = '%-14s %-12s %9.3f ms' % (name, op, ms)
+
+                if base is not None:
+                    line += '   baseline %9.3f ms %+7.1f%%' % (base,
+                        (ms / base - 1) * 100 if base else 0)
+                    if ms > base * (1 + threshold) and \
+                            ms - base > minSlowdownMs:
+                        line += '   REGRESSION'
+                        regressions.append((name, op))
+
+                print(line)
+                sys.stdout.flush()
+
+    if update:
+        saveBaselines(results, threshold)
+        print('baselines stored in %s' % baselinesFile)
+
+    if check and regressions:
+        print('%d regressions over %d%%: %s' % (len(regressions),
+            threshold * 100, ', '.join('%s %s' % item
+            for item in regressions)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
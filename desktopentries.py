@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# The installed applications, read from the .desktop files of the XDG
+# applications directories. The parsed files are kept in an index on disk
+# keyed by the mtime of their directory, so only the directories that
+# changed since the last run are read again.
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from wbarconfig import cachePath, dataDirs, loadIndex, saveIndex
+
+# Field codes of the Exec key, wbar runs the command without arguments
+# https://specifications.freedesktop.org/desktop-entry-spec/latest/
+FIELD_CODES = re.compile(r'\s*%[fFuUdDnNickvm]')
+
+def applicationDirs():
+    """The applications directories, the user's one first."""
+
+    return [os.path.join(direc, 'applications') for direc in dataDirs()]
+
+
+def execCommand(value):
+
+    command = FIELD_CODES.sub('', value)
+    return command.replace('%%', '%').strip()
+
+
+def parseDesktopFile(path):
+    """Return the name, command and icon of a launchable application as a
+    dict, or None for hidden entries, links and directories."""
+
+    keys = {}
+    inEntry = False
+
+    try:
+        with open(path, 'r', encoding = 'utf-8', errors = 'replace') as fh:
+            for line in fh:
+                line = line.strip()
+                if line.startswith('['):
+                    # Only the main group, the actions come after it
+                    if inEntry:
+                        break
+                    inEntry = line == '[Desktop Entry]'
+                elif inEntry and '=' in line and not line.startswith('#'):
+                    key, value = line.split('=', 1)
+                    keys.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+
+    if (keys.get('Type') != 'Application' or not keys.get('Exec') or
+            keys.get('NoDisplay') == 'true' or keys.get('Hidden') == 'true'):
+        return None
+
+    return {'name': keys.get('Name', ''), 'command':
+        execCommand(keys['Exec']), 'icon': keys.get('Icon', '')}
+
+
+class ApplicationIndex(object):
+    """The applications found in the applications directories. Each
+    directory's .desktop files are parsed on a thread pool when its mtime
+    differs from the one in the index, and a desktop file id found in an
+    earlier directory hides the same id in the later ones."""
+
+    indexVersion = 1
+
+    def __init__(self, dirs = None, indexFile = None, jobs = 8):
+
+        self.dirs = dirs or applicationDirs()
+        self.indexFile = indexFile or cachePath('applications.json')
+        self.jobs = jobs
+
+        # directory -> [mtime, {file name -> entry or None}]
+        self._index = None
+        self._dirty = False
+
+    def save(self):
+
+        if self._dirty and saveIndex(self.indexFile, self.indexVersion,
+                self._index):
+            self._dirty = False
+
+    def _changedDirs(self):
+        """Walk the applications directories, drop the ones gone from the
+        index and return (directory, mtime, files) of the changed ones."""
+
+        changed = []
+        seen = set()
+
+        for top in self.dirs:
+            for root, dirs, files in os.walk(top):
+                seen.add(root)
+                try:
+                    mtime = int(os.stat(root).st_mtime)
+                except OSError:
+                    continue
+
+                cached = self._index.get(root)
+                if cached is None or cached[0] != mtime:
+                    changed.append((root, mtime, sorted(name for name in files
+                        if name.endswith('.desktop'))))
+
+        for root in set(self._index) - seen:
+            del self._index[root]
+            self._dirty = True
+
+        return changed
+
+    def entries(self):
+        """Return the applications as a list of dicts with the desktop file
+        'id', 'name', 'command' and 'icon', sorted by name."""
+
+        if self._index is None:
+            self._index = loadIndex(self.indexFile, self.indexVersion)
+
+        changed = self._changedDirs()
+        if changed:
+            paths = [os.path.join(root, name) for root, _, files in changed
+                for name in files]
+            with ThreadPoolExecutor(self.jobs) as pool:
+                parsed = iter(pool.map(parseDesktopFile, paths))
+
+            for root, mtime, files in changed:
+                self._index[root] = [mtime, dict((name, next(parsed))
+                    for name in files)]
+            self._dirty = True
+
+        apps = {}
+        for top in self.dirs:
+            for root, (mtime, files) in self._index.items():
+                if root != top and not root.startswith(top + os.sep):
+                    continue
+
+                # The id of kde/app.desktop is kde-app.desktop
+                prefix = os.path.relpath(root, top).replace(os.sep, '-')
+                for name, entry in files.items():
+                    fileId = name if prefix == '.' else prefix + '-' + name
+                    if fileId not in apps:
+                        apps[fileId] = entry
+
+        return sorted((dict(entry, id = fileId) for fileId, entry in
+            apps.items() if entry), key = lambda e: e['name'].lower())
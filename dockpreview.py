@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import math
+import time
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QTimer, QRect, QSize
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QImage
+from thumbnailcache import ThumbnailLoader
+from wbarconfig import OPTIONS
+
+
+class DockPreview(QWidget):
+    """Draws the dock the way wbar would with the given options: the icons
+    in a row on the bar, zoomed around the pointer and jumping when clicked.
+    The icons painted are decoded off the GUI thread, once for a range of
+    sizes, and scaled once per zoom step into a sprite. The frame timer only
+    runs while something moves."""
+
+    frameInterval = 16
+
+    # How much of the way to the target zoom an icon goes in one frame
+    easing = 0.35
+
+    # Length of a jump, in seconds
+    jumpTime = 0.3
+
+    # The zoom of an icon is drawn in this many steps, so each icon has a
+    # few sprite sizes and a sweep along the dock reuses them
+    zoomSteps = 8
+
+    # The icons are decoded at a multiple of this size, so changing the
+    # zoom or the icon size a little scales the images already decoded
+    sourceStep = 32
+
+    maxSprites = 1024
+
+    def __init__(self, *args, **kwargs):
+
+        super(DockPreview, self).__init__(*args, **kwargs)
+
+        self.paths = []
+        self.titles = []
+        self.barImage = ''
+
+        # path -> (requested size, QImage) of the decoded icons
+        self._sources = {}
+        self._barPixmap = QPixmap()
+
+        # (path, size, tint) -> QPixmap
+        self._sprites = OrderedDict()
+
+        # The zoom of each icon from 0 to 1, the pointer position along the
+        # bar or None, and row -> start time of the icons jumping
+        self._zoom = []
+        self._pointer = None
+        self._jumps = {}
+
+        # Frames drawn, for the benchmarks
+        self.frames = 0
+
+        self.loader = ThumbnailLoader(parent = self)
+        self.loader.loaded.connect(self._onLoaded)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.frameInterval)
+        self.timer.timeout.connect(self.step)
+
+        self.setMouseTracking(True)
+        self.setOptions({})
+
+    def setIcons(self, listIcons):
+
+        self.paths = [entry.icon for entry in listIcons]
+        self.titles = [entry.title for entry in listIcons]
+        self._zoom = [0.0] * len(self.paths)
+        self._jumps = {}
+        self._requestSources()
+        self._resize()
+
+    def setBarImage(self, path):
+
+        if path != self.barImage:
+            self.barImage = path
+            self._barPixmap = QPixmap(path) if path else QPixmap()
+            self.update()
+
+    def setOptions(self, values):
+        """Take the wbar options, a flag -> value mapping of the options
+        that are set as optionValues() returns it."""
+
+        # The options not set, or not valid, take the dialog's defaults
+        def value(flag, kind = str):
+            try:
+                return kind(values.get(flag) or OPTIONS[flag].default)
+            except (TypeError, ValueError):
+                return kind(OPTIONS[flag].default)
+
+        self.iconSize = value('--isize', int)
+        self.iconDist = value('--idist', int)
+        self.nanim = value('--nanim', int)
+        self.zoomf = value('--zoomf', float)
+        self.jumpf = value('--jumpf', float)
+        self.barAlfa = value('--balfa', int)
+        self.unfocusAlfa = value('--falfa', int)
+        self.filterMode = value('--filter')
+        self.filterColor = QColor.fromRgba(value('--fc',
+            lambda color: int(color, 16)))
+        self.vertical = '--vbar' in values
+        self.showTitles = '--nofont' not in values
+
+        self._requestSources()
+        self._resize()
+
+    def maxIconSize(self):
+        return int(self.iconSize * max(self.zoomf, 1) + 0.5)
+
+    def sourceSize(self):
+        return -(-self.maxIconSize() // self.sourceStep) * self.sourceStep
+
+    def _requestSources(self):
+
+        # The icons painted next ask for their images, at the new size
+        self.loader.cancelAll()
+        self.update()
+
+    def _requestSource(self, path):
+
+        # A larger image than needed is only scaled down
+        size = self.sourceSize()
+        source = self._sources.get(path)
+        if source is None or source[0] < size:
+            self.loader.request(path, size, size)
+
+    def _onLoaded(self, path, width, height, image):
+
+        self._sources[path] = (width, image)
+        self._dropSprites(path)
+        self.update()
+
+    def _dropSprites(self, path):
+
+        for key in [key for key in self._sprites if key[0] == path]:
+            del self._sprites[key]
+
+    def sprite(self, path, size, tint = None):
+
+        key = (path, size, tint)
+        pixmap = self._sprites.get(key)
+        if pixmap is not None:
+            self._sprites.move_to_end(key)
+            return pixmap
+
+        source = self._sources.get(path)
+        if source is None or source[1].isNull():
+            return None
+
+        image = source[1].scaled(size, size, Qt.KeepAspectRatio,
+            Qt.SmoothTransformation)
+
+        # The color filter of wbar, blended over the opaque pixels only
+        if tint is not None:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceAtop)
+            painter.fillRect(image.rect(), QColor.fromRgba(tint))
+            painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+        self._sprites[key] = pixmap
+        if len(self._sprites) > self.maxSprites:
+            self._sprites.popitem(last = False)
+
+        return pixmap
+
+    # Geometry, along and across the bar
+
+    def _pitch(self):
+        return self.iconSize + self.iconDist
+
+    def _acrossSize(self):
+
+        titleHeight = self.fontMetrics().height() if self.showTitles else 0
+        return (int(self.iconSize * max(self.zoomf, 1) +
+            self.iconSize * self.jumpf) + 2 * self.iconDist + titleHeight)
+
+    def _alongSize(self):
+
+        # Room for the icons growing around the pointer
+        grown = int(self.iconSize * max(self.zoomf - 1, 0) * self.nanim)
+        return len(self.paths) * self._pitch() + self.iconDist + grown
+
+    def _resize(self):
+
+        along, across = self._alongSize(), self._acrossSize()
+        size = QSize(across, along) if self.vertical else QSize(along, across)
+        self.setMinimumSize(size)
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self):
+        return self.minimumSize()
+
+    def _length(self):
+        return self.height() if self.vertical else self.width()
+
+    def _breadth(self):
+        return self.width() if self.vertical else self.height()
+
+    def _rect(self, along, across, alongSize, acrossSize):
+
+        if self.vertical:
+            return QRect(across, along, acrossSize, alongSize)
+
+        return QRect(along, across, alongSize, acrossSize)
+
+    def _barStart(self):
+
+        # Where the unzoomed row of icons starts, centered
+        return (self._length() - len(self.paths) * self._pitch() -
+            self.iconDist) // 2
+
+    def rowAt(self, along):
+        """The icon under a position along the bar, or -1."""
+
+        offset = along - self._barStart() - self.iconDist
+        row = int(offset // self._pitch()) if offset >= 0 else -1
+        return row if 0 <= row < len(self.paths) else -1
+
+    def targetZoom(self, row):
+
+        if self._pointer is None:
+            return 0.0
+
+        # Distance to the pointer in icons, the zoom fades out over about
+        # nanim icons
+        center = self._barStart() + self.iconDist + (row + 0.5) * \
+            self._pitch()
+        distance = abs(self._pointer - center) / self._pitch()
+        radius = (self.nanim + 1) / 2.0
+
+        if distance >= radius:
+            return 0.0
+
+        return (math.cos(math.pi * distance / radius) + 1) / 2
+
+    def iconSizes(self):
+
+        growth = self.iconSize * (self.zoomf - 1)
+        steps = self.zoomSteps
+        return [int(self.iconSize + growth * round(zoom * steps) / steps +
+            0.5) for zoom in self._zoom]
+
+    # Animation
+
+    def step(self):
+        """Move the animation one frame on, stop the timer once still."""
+
+        moving = False
+        for row, zoom in enumerate(self._zoom):
+            target = self.targetZoom(row)
+            if zoom == target:
+                continue
+
+            zoom += (target - zoom) * self.easing
+            if abs(target - zoom) < 0.01:
+                zoom = target
+            else:
+                moving = True
+            self._zoom[row] = zoom
+
+        now = time.perf_counter()
+        for row, start in list(self._jumps.items()):
+            if now - start >= self.jumpTime:
+                del self._jumps[row]
+        moving = moving or bool(self._jumps)
+
+        if not moving:
+            self.timer.stop()
+
+        self.update()
+
+    def _animate(self):
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _along(self, event):
+        return event.y() if self.vertical else event.x()
+
+    def mouseMoveEvent(self, event):
+
+        self._pointer = self._along(event)
+        self._animate()
+
+    def leaveEvent(self, event):
+
+        self._pointer = None
+        self._animate()
+
+    def mousePressEvent(self, event):
+
+        row = self.rowAt(self._along(event))
+        if row >= 0 and self.jumpf > 0:
+            self._jumps[row] = time.perf_counter()
+            self._animate()
+
+    def jumpHeight(self, row):
+
+        start = self._jumps.get(row)
+        if start is None:
+            return 0
+
+        t = (time.perf_counter() - start) / self.jumpTime
+        return int(self.iconSize * self.jumpf * math.sin(math.pi *
+            min(t, 1.0)))
+
+    # Painting
+
+    def _tint(self, row, hovered):
+
+        if self.filterMode == '3' or (self.filterMode == '1' and
+                row == hovered) or (self.filterMode == '2' and
+                row != hovered):
+            return self.filterColor.rgba()
+
+        return None
+
+    def paintEvent(self, event):
+
+        painter = QPainter(self)
+        self.drawDock(painter, event.rect())
+        painter.end()
+
+    def drawDock(self, painter, exposed = None):
+
+        self.frames += 1
+        focused = self._pointer is not None
+
+        # The bar, with the icons resting on it at the far side
+        start = self._barStart()
+        barAcross = self.iconSize + 2 * self.iconDist
+        barRect = self._rect(start, self._breadth() - barAcross,
+            len(self.paths) * self._pitch() + self.iconDist, barAcross)
+
+        painter.setOpacity(self.barAlfa / 100.0)
+        if self._barPixmap.isNull():
+            painter.fillRect(barRect, QColor(40, 40, 40))
+        else:
+            painter.drawPixmap(barRect, self._barPixmap)
+
+        painter.setOpacity(1.0 if focused else self.unfocusAlfa / 100.0)
+
+        # The row grows from the center of the bar as icons zoom in
+        sizes = self.iconSizes()
+        length = sum(sizes) + len(sizes) * self.iconDist - self.iconDist
+        along = (self._length() - length) // 2
+        base = self._breadth() - self.iconDist
+
+        hovered = self.rowAt(self._pointer) if focused else -1
+        titleRect = None
+
+        for row, (path, size) in enumerate(zip(self.paths, sizes)):
+            across = base - size - self.jumpHeight(row)
+            rect = self._rect(along, across, size, size)
+            along += size + self.iconDist
+
+            # Only the icons in the part of the dock to repaint
+            if exposed is not None and not exposed.intersects(rect):
+                continue
+
+            self._requestSource(path)
+            pixmap = self.sprite(path, size, self._tint(row, hovered))
+            if pixmap is None:
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+            else:
+                painter.drawPixmap(rect.x() + (size - pixmap.width()) // 2,
+                    rect.y() + (size - pixmap.height()) // 2, pixmap)
+
+            if row == hovered:
+                titleRect = rect
+
+        if self.showTitles and titleRect is not None:
+            painter.setOpacity(1.0)
+            painter.setPen(QColor(Qt.white))
+            height = self.fontMetrics().height()
+            if self.vertical:
+                rect = QRect(titleRect.right() + 4, titleRect.y(), 200,
+                    titleRect.height())
+                flags = Qt.AlignLeft | Qt.AlignVCenter
+            else:
+                rect = QRect(titleRect.center().x() - 100,
+                    titleRect.y() - height, 200, height)
+                flags = Qt.AlignHCenter | Qt.AlignBottom
+            painter.drawText(rect, flags, self.titles[hovered])
@@ -5,14 +5,21 @@
 import os
 import sys
 from PyQt5.QtWidgets import (QHBoxLayout, QVBoxLayout, QFileDialog, QLabel,
-    QSpinBox)
+    QSpinBox, QCheckBox, QListWidget, QListWidgetItem)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QFontDatabase
+from PyQt5.QtGui import QPixmap
+from thumbnailcache import ThumbnailCache, ThumbnailLoader
+from fontcatalog import FontCatalog
+from fontspecimen import SpecimenDelegate, FontPathRole
+from wbartrace import span
 
 # File Dialog with preview for images selected
 # https://stackoverflow.com/questions/47599170/qfiledialog-preview
 class ImageDialogPreview(QFileDialog):
 
+    # Previews kept in memory
+    maxPreviews = 24
+
     def __init__(self, imagePath = None, *args, **kwargs):
 
         QFileDialog.__init__(self, *args, **kwargs)
@@ -33,6 +40,14 @@ class ImageDialogPreview(QFileDialog):
 
         self.layout().addLayout(vbox, 1, 3, 1, 1)
 
+        # Decoded off the GUI thread, a few previews are kept so going back
+        # to one shows it at once. The files browsed are mostly not icons,
+        # so they stay out of the shared cache and of the thumbnails on disk
+        self.cache = ThumbnailCache(self.maxPreviews, saveThumbnails = False)
+        self.loader = ThumbnailLoader(self.cache, 2, self)
+        self.loader.loaded.connect(self.onLoaded)
+        self.previewPath = None
+
         self.currentChanged.connect(self.onChange)
         self.fileSelected.connect(self.onFileSelected)
 #         self.filesSelected.connect(self.onFilesSelected)
@@ -45,14 +60,32 @@ class ImageDialogPreview(QFileDialog):
 
     def onChange(self, path):
 
-        pixmap = QPixmap(path)
+        width, height = self.mpPreview.width(), self.mpPreview.height()
 
-        if(pixmap.isNull()):
-            self.mpPreview.setText("Preview")
+        # Only the last file matters, drop the requests of the ones passed
+        self.loader.cancelAll()
+        self.previewPath = path
+
+        image = self.cache.cached(path, width, height)
+        if image is not None:
+            self.showPreview(image)
+        elif os.path.isfile(path):
+            self.loader.request(path, width, height)
         else:
-            self.mpPreview.setPixmap(pixmap.scaled(self.mpPreview.width(), 
-                self.mpPreview.height(), Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation))
+            self.mpPreview.setText("Preview")
+
+    def onLoaded(self, path, width, height, image):
+
+        if path == self.previewPath:
+            self.showPreview(image)
+
+    def showPreview(self, image):
+
+        with span('imagePreview.show'):
+            if(image.isNull()):
+                self.mpPreview.setText("Preview")
+            else:
+                self.mpPreview.setPixmap(QPixmap.fromImage(image))
 
     def onFileSelected(self, file):
         self._fileSelected = file
@@ -64,12 +97,17 @@ class ImageDialogPreview(QFileDialog):
 class FontDialogPreview(QFileDialog):
 
     def __init__(self, fontPath, fontSize, fontSizeMin, fontSizeMax, 
-                 *args, **kwargs):
+                 catalog = None, *args, **kwargs):
 
         QFileDialog.__init__(self, *args, **kwargs)
 
         self.setOption(QFileDialog.DontUseNativeDialog, True)
 
+        # Fonts are registered through the catalog, once per file
+        if catalog is None:
+            catalog = FontCatalog(['.ttf', '.otf'])
+        self.catalog = catalog
+
         self.fontSizeMin = fontSizeMin
         self.fontSizeMax = fontSizeMax
         self.fontPath = fontPath
@@ -94,57 +132,92 @@ class FontDialogPreview(QFileDialog):
         self.fontSizeSpinBoxDlg.valueChanged.connect(self.onSizeSelected)
         hbox.addWidget(self.fontSizeSpinBoxDlg)
 
+        self.gridCheckBox = QCheckBox('Specimens of the directory')
+        self.gridCheckBox.setToolTip('Show every font of the directory at '
+            + 'the selected size')
+        self.gridCheckBox.toggled.connect(self.onGridToggled)
+        vbox.addWidget(self.gridCheckBox)
+
         self.fontPreviewDlg = QLabel(self.previewText)   
         self.fontPreviewDlg.setFixedSize(250, 250)
         self.fontPreviewDlg.setAlignment(Qt.AlignCenter)
         vbox.addWidget(self.fontPreviewDlg)
 
+        # The specimens are rendered on worker threads, for the rows in
+        # view only, and kept as tiles per file and size
+        self.specimenDelegate = SpecimenDelegate(self.fontSize, 230, self)
+        self.specimenList = QListWidget()
+        self.specimenList.setFixedWidth(250)
+        self.specimenList.setUniformItemSizes(True)
+        self.specimenList.setVerticalScrollMode(QListWidget.ScrollPerPixel)
+        self.specimenList.setItemDelegate(self.specimenDelegate)
+        self.specimenDelegate.attach(self.specimenList)
+        self.specimenList.currentItemChanged.connect(self.onSpecimenClicked)
+        self.specimenList.hide()
+        vbox.addWidget(self.specimenList, 1)
+
         vbox.addStretch()
 
         self.layout().addLayout(vbox, 1, 3, 1, 1)
 
         self.currentChanged.connect(self.onChange)
         self.fileSelected.connect(self.onFileSelected)
+        self.directoryEntered.connect(self.fillSpecimens)
 
         if fontPath:
             self.onChange(fontPath)
 
-    def _getDatabaseFont(self, fntPth, size):
-
-        db = QFontDatabase()
-        fontId = db.addApplicationFont(fntPth)
-        family = db.applicationFontFamilies(fontId)[0]
-        styles = db.styles(family)
-
-        # Check if the style is part of the name or not.
-        # If yes, then use that style, otherwise use 'Regular'
-        fontfile = os.path.basename(fntPth)
-        matchFound = False
-        for style in styles:
-            s = style.replace(' ','')  # Delete the space in style
-            if s in fontfile:
-                matchFound = True
-                break
-        
-        if matchFound:
-            font = db.font(family, style, size)
-        else:
-            font = db.font(family, 'Regular', size)
-
-        return font
-
     def onChange(self, fontPath):
         
         if os.path.isfile(fontPath):
             self.fontSize = self.fontSizeSpinBoxDlg.value()            
-            self.font = self._getDatabaseFont(fontPath, self.fontSize)
-            self.fontPreviewDlg.setFont(self.font)
+            with span('fontPreview'):
+                font = self.catalog.font(fontPath, self.fontSize)
+            if font is not None:
+                self.font = font
+                self.fontPreviewDlg.setFont(self.font)
 
     def onFileSelected(self, file):
         self.fontPath = file
 
+    def onGridToggled(self, checked):
+
+        self.fontPreviewDlg.setVisible(not checked)
+        self.specimenList.setVisible(checked)
+        if checked:
+            self.fillSpecimens(self.directory().absolutePath())
+
+    def fillSpecimens(self, direc):
+
+        if not self.gridCheckBox.isChecked():
+            return
+
+        self.specimenList.clear()
+        self.specimenDelegate.loader.cancelAll()
+
+        try:
+            names = sorted(os.listdir(direc))
+        except OSError:
+            names = []
+
+        exts = tuple(ext.lower() for ext in self.catalog.exts)
+        for name in names:
+            path = os.path.join(direc, name)
+            if name.lower().endswith(exts) and os.path.isfile(path):
+                item = QListWidgetItem(name)
+                item.setData(FontPathRole, path)
+                item.setToolTip(path)
+                self.specimenList.addItem(item)
+
+    def onSpecimenClicked(self, item, previous):
+
+        if item is not None:
+            self.selectFile(item.data(FontPathRole))
+            self.onChange(item.data(FontPathRole))
+
     def onSizeSelected(self, sz):
         self.fontSize = sz
+        self.specimenDelegate.setFontSize(sz)
 
         self.font = self.fontPreviewDlg.font()
         self.font.setPointSize(self.fontSize)
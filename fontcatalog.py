@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import os
+
+from PyQt5.QtGui import QFontDatabase
+
+from wbarconfig import FontResolver
+from wbartrace import span
+
+
+class FontCatalog(object):
+    """The fonts previewed by the dialog. Every file is added to the
+    application font database at most once, on its first preview, and its
+    family is remembered for the later ones."""
+
+    def __init__(self, exts):
+
+        self.exts = tuple(exts)
+        self.resolver = FontResolver(self.exts)
+
+        # path -> family of the fonts added to the font database
+        self._registered = {}
+        self._db = None
+
+    def register(self, path):
+        """Add the font to the application font database unless it is
+        there already, and return its family."""
+
+        if path in self._registered:
+            return self._registered[path]
+
+        if self._db is None:
+            self._db = QFontDatabase()
+
+        with span('font.register'):
+            fontId = self._db.addApplicationFont(path)
+        families = self._db.applicationFontFamilies(fontId)
+        family = families[0] if families else None
+
+        self._registered[path] = family
+        return family
+
+    def _matchStyle(self, path, family):
+
+        # Check if the style is part of the name or not.
+        # If yes, then use that style, otherwise use 'Regular'
+        fontfile = os.path.basename(path)
+        for style in self._db.styles(family):
+            s = style.replace(' ','')  # Delete the space in style
+            if s in fontfile:
+                return style
+
+        return 'Regular'
+
+    def font(self, path, size):
+
+        family = self.register(path)
+        if family is None:
+            return None
+
+        style = self._matchStyle(path, family)
+
+        return self._db.font(family, style, size)
+
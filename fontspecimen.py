@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QSize, QPointF
+from PyQt5.QtGui import (QImage, QPixmap, QPainter, QRawFont, QGlyphRun,
+    QColor)
+from thumbnailcache import ThumbnailLoader
+from wbartrace import span
+
+# Role under which the font list hands the font path to the delegate
+FontPathRole = Qt.UserRole + 1
+
+
+class SpecimenCache(object):
+    """Specimens of font files rendered into QImage tiles, in an LRU keyed
+    by path, mtime, tile width and font size. The fonts are read with
+    QRawFont, so nothing is added to the font database, and image() may be
+    called from the worker threads of a ThumbnailLoader with the font size
+    in place of the height."""
+
+    def __init__(self, text = 'AaBbYyZz', maxItems = 512):
+
+        self.text = text
+        self.maxItems = maxItems
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def image(self, path, width, size):
+
+        try:
+            key = (path, int(os.stat(path).st_mtime), width, size)
+        except (OSError, TypeError, ValueError):
+            return QImage()
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        with span('specimen.render'):
+            image = self.render(path, width, size)
+
+        with self._lock:
+            self._images[key] = image
+            if len(self._images) > self.maxItems:
+                self._images.popitem(last = False)
+
+        return image
+
+    def render(self, path, width, size):
+
+        # A QRawFont belongs to the thread that made it, one per tile
+        raw = QRawFont(path, size)
+        if not raw.isValid():
+            return QImage()
+
+        glyphs = raw.glyphIndexesForString(self.text)
+        run = QGlyphRun()
+        run.setRawFont(raw)
+        run.setGlyphIndexes(glyphs)
+
+        # Lay the glyphs out on the baseline one after the other
+        x = 0.0
+        positions = []
+        for advance in raw.advancesForGlyphIndexes(glyphs):
+            positions.append(QPointF(x, 0))
+            x += advance.x()
+        run.setPositions(positions)
+
+        ascent = int(raw.ascent() + 0.5)
+        height = max(ascent + int(raw.descent() + 0.5), 1)
+
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        painter.setPen(QColor(Qt.black))
+        painter.drawGlyphRun(QPointF(0, ascent), run)
+        painter.end()
+
+        return image
+
+
+class SpecimenDelegate(QStyledItemDelegate):
+    """Paints the file name and the specimen of the font of each row. As in
+    IconDelegate, only the rows the view paints are requested and they are
+    rendered off the GUI thread."""
+
+    maxPixmaps = 512
+
+    def __init__(self, size = 12, width = 230, *args, **kwargs):
+
+        super(SpecimenDelegate, self).__init__(*args, **kwargs)
+        self.size = size
+        self.width = width
+        self.view = None
+        self._pixmaps = OrderedDict()
+
+        self.loader = ThumbnailLoader(SpecimenCache(), parent = self)
+        self.loader.loaded.connect(self._onLoaded)
+
+    def attach(self, view):
+
+        self.view = view
+        view.verticalScrollBar().valueChanged.connect(self.cancelHidden)
+
+    def setFontSize(self, size):
+
+        # The tiles of the other sizes stay in the cache of the loader
+        self.size = size
+        self._pixmaps.clear()
+        self.loader.cancelAll()
+
+        if self.view is not None:
+            # The rows get taller or shorter with the font
+            self.sizeHintChanged.emit(self.view.model().index(0, 0))
+            self.view.doItemsLayout()
+
+    def cancelHidden(self, *args):
+
+        if self.view is not None:
+            self.loader.cancelHidden(self.view, FontPathRole)
+
+    def _onLoaded(self, path, width, size, image):
+
+        if size != self.size:
+            return
+
+        self._pixmaps[path] = QPixmap.fromImage(image)
+        if len(self._pixmaps) > self.maxPixmaps:
+            self._pixmaps.popitem(last = False)
+
+        if self.view is not None:
+            self.view.viewport().update()
+
+    def specimen(self, path):
+
+        pixmap = self._pixmaps.get(path)
+
+        if pixmap is None:
+            self.loader.request(path, self.width, self.size)
+        else:
+            self._pixmaps.move_to_end(path)
+
+        return pixmap
+
+    def paint(self, painter, option, index):
+
+        path = index.data(FontPathRole)
+        if path is None:
+            return super(SpecimenDelegate, self).paint(painter, option, index)
+
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter,
+                option.widget)
+
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        nameHeight = option.fontMetrics.height()
+        painter.drawText(rect.x(), rect.y(), rect.width(), nameHeight,
+            Qt.AlignLeft | Qt.AlignVCenter, option.fontMetrics.elidedText(
+            os.path.basename(path), Qt.ElideMiddle, rect.width()))
+
+        pixmap = self.specimen(path)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(rect.x(), rect.y() + nameHeight, pixmap)
+
+    def sizeHint(self, option, index):
+
+        # The same for every row, so that the view need not measure them
+        return QSize(self.width, option.fontMetrics.height() +
+            int(self.size * 1.4) + 4)
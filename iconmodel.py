@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import (QApplication, QStyledItemDelegate, QStyle,
+    QUndoCommand)
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QSize,
+    QMimeData, QSortFilterProxyModel)
+from PyQt5.QtGui import QPixmap
+from thumbnailcache import ThumbnailLoader
+from wbarconfig import IconEntry
+
+# Role under which the model hands the icon path to the delegate
+IconPathRole = Qt.UserRole + 1
+
+# Mime type of the rows dragged within the table
+IconRowsMimeType = 'application/x-wbar-icon-rows'
+
+
+def rowRuns(rows):
+    """Split sorted rows into (first, last) runs of adjacent rows."""
+
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+
+    return [tuple(run) for run in runs]
+
+
+class IconTableModel(QAbstractTableModel):
+    """Table model over the list of IconEntry objects of the dock. The list
+    is shared with the dialog and only changed through the methods below so
+    that the view gets a signal for the rows that actually changed."""
+
+    columns = ('icon', 'title', 'command')
+    headers = ('Icon', 'Title', 'Command')
+
+    def __init__(self, listIcons = None, *args, **kwargs):
+
+        super(IconTableModel, self).__init__(*args, **kwargs)
+        self.listIcons = listIcons if listIcons is not None else []
+
+        # With an undo stack, the edits made in the view are pushed on it
+        self.undoStack = None
+
+    def setIcons(self, listIcons):
+
+        self.beginResetModel()
+        self.listIcons = listIcons
+        self.endResetModel()
+
+    def rowCount(self, parent = QModelIndex()):
+        return 0 if parent.isValid() else len(self.listIcons)
+
+    def columnCount(self, parent = QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+
+        return None
+
+    def flags(self, index):
+
+        flags = super(IconTableModel, self).flags(index)
+        if not index.isValid():
+            return flags | Qt.ItemIsDropEnabled
+
+        flags |= Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled
+        if index.column() > 0:
+            flags |= Qt.ItemIsEditable
+
+        return flags
+
+    def data(self, index, role = Qt.DisplayRole):
+
+        if not index.isValid():
+            return None
+
+        entry = self.listIcons[index.row()]
+        col = index.column()
+
+        if col == 0:
+            if role == IconPathRole or role == Qt.ToolTipRole:
+                return entry.icon
+
+        elif role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            return getattr(entry, self.columns[col])
+
+        return None
+
+    def setData(self, index, value, role = Qt.EditRole):
+
+        if not index.isValid() or index.column() == 0 or role != Qt.EditRole:
+            return False
+
+        row, column = index.row(), index.column()
+        value = str(value)
+
+        if self.undoStack is None:
+            self.setField(row, column, value)
+        elif value != getattr(self.listIcons[row], self.columns[column]):
+            self.undoStack.push(SetIconFieldCommand(self, row, column, value))
+
+        return True
+
+    def setField(self, row, column, value):
+
+        setattr(self.listIcons[row], self.columns[column], value)
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index, [Qt.EditRole])
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [IconRowsMimeType]
+
+    def mimeData(self, indexes):
+
+        rows = sorted(set(index.row() for index in indexes))
+        data = QMimeData()
+        data.setData(IconRowsMimeType, ' '.join(map(str, rows)).encode())
+
+        return data
+
+    def dropMimeData(self, data, action, row, column, parent):
+
+        if action != Qt.MoveAction or not data.hasFormat(IconRowsMimeType):
+            return False
+
+        rows = [int(r) for r in bytes(data.data(IconRowsMimeType)).split()]
+
+        # Dropped onto a row means before it, below the last row at the end
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self.listIcons)
+
+        # The position among the rows that are not moved
+        moved = set(rows)
+        dest = sum(1 for r in range(row) if r not in moved)
+
+        command = MoveIconsCommand(self, rows, dest)
+        if command.isNoop():
+            return False
+
+        if self.undoStack is None:
+            command.redo()
+        else:
+            self.undoStack.push(command)
+
+        # The rows are moved already, the view must not remove them
+        return True
+
+    def insertIcon(self, row, entry):
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.listIcons.insert(row, entry)
+        self.endInsertRows()
+
+    def removeIcon(self, row):
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del(self.listIcons[row])
+        self.endRemoveRows()
+
+    def removeIcons(self, rows):
+
+        # One signal per run of adjacent rows, the last run first so that
+        # the rows of the others stay valid
+        for first, last in reversed(rowRuns(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del(self.listIcons[first:last+1])
+            self.endRemoveRows()
+
+    def insertIcons(self, rows, entries):
+
+        # The reverse of removeIcons: the entries go back to the sorted rows
+        pos = 0
+        for first, last in rowRuns(rows):
+            count = last - first + 1
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.listIcons[first:first] = entries[pos:pos+count]
+            self.endInsertRows()
+            pos += count
+
+    def reorder(self, order):
+
+        # Row i of the new list is row order[i] of the old one. The selection
+        # and the other persistent indexes follow their rows.
+        self.layoutAboutToBeChanged.emit()
+
+        newRows = [0] * len(order)
+        for new, old in enumerate(order):
+            newRows[old] = new
+
+        self.listIcons[:] = [self.listIcons[old] for old in order]
+
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent,
+            [self.index(newRows[index.row()], index.column())
+            for index in persistent])
+
+        self.layoutChanged.emit()
+
+    def replaceIcon(self, row, entry):
+
+        # Update the entry in place so that it keeps its block in the
+        # config document
+        target = self.listIcons[row]
+        target.icon, target.command, target.title = entry.values()
+        self.dataChanged.emit(self.index(row, 0),
+            self.index(row, self.columnCount() - 1))
+
+    def moveIcon(self, row, dest):
+
+        if row == dest:
+            return False
+
+        # beginMoveRows wants the position before which the row is inserted,
+        # counted before the row is taken out.
+        destChild = dest + 1 if dest > row else dest
+        if not self.beginMoveRows(QModelIndex(), row, row, QModelIndex(),
+                destChild):
+            return False
+
+        self.listIcons.insert(dest, self.listIcons.pop(row))
+        self.endMoveRows()
+
+        return True
+
+
+def searchKey(entry):
+    return ('%s\n%s' % (entry.title, entry.command)).lower()
+
+
+class IconFilterProxy(QSortFilterProxyModel):
+    """Shows the icons whose title or command contains the filter text,
+    ignoring case. The lowercase text of every entry is kept in an index
+    that follows the edits of the source model, and a filter text that
+    extends the previous one only searches the previous matches."""
+
+    def __init__(self, *args, **kwargs):
+
+        super(IconFilterProxy, self).__init__(*args, **kwargs)
+
+        self.query = ''
+
+        # id(entry) -> lowercase title and command of the source entries
+        self._keys = {}
+
+        # ids of the entries matching the query, None shows all of them
+        self._matches = None
+        self._listIcons = []
+
+    def setSourceModel(self, model):
+
+        # Connected before the proxy's own handlers, so the index is up to
+        # date when the proxy filters the new or changed rows.
+        model.modelReset.connect(self._rebuild)
+        model.rowsInserted.connect(self._onRowsInserted)
+        model.rowsAboutToBeRemoved.connect(self._onRowsAboutToBeRemoved)
+        model.dataChanged.connect(self._onDataChanged)
+
+        super(IconFilterProxy, self).setSourceModel(model)
+        self._rebuild()
+
+    def _rebuild(self):
+
+        # Kept here, filterAcceptsRow runs for every row on each keystroke
+        self._listIcons = self.sourceModel().listIcons
+
+        self._keys = dict((id(entry), searchKey(entry))
+            for entry in self._listIcons)
+        self._matches = self._search(self._keys, self.query) \
+            if self.query else None
+
+    def _search(self, ids, query):
+        return set(i for i in ids if query in self._keys[i])
+
+    def _update(self, first, last):
+
+        for entry in self.sourceModel().listIcons[first:last+1]:
+            key = self._keys[id(entry)] = searchKey(entry)
+            if self._matches is not None:
+                if self.query in key:
+                    self._matches.add(id(entry))
+                else:
+                    self._matches.discard(id(entry))
+
+    def _onRowsInserted(self, parent, first, last):
+        self._update(first, last)
+
+    def _onDataChanged(self, topLeft, bottomRight, roles = []):
+        self._update(topLeft.row(), bottomRight.row())
+
+    def _onRowsAboutToBeRemoved(self, parent, first, last):
+
+        for entry in self.sourceModel().listIcons[first:last+1]:
+            self._keys.pop(id(entry), None)
+            if self._matches is not None:
+                self._matches.discard(id(entry))
+
+    def setFilterText(self, text):
+
+        query = text.lower()
+        if query == self.query:
+            return
+
+        # Narrowing down, only the previous matches can still match
+        narrowing = (self.query and self.query in query and
+            self._matches is not None)
+        candidates = self._matches if narrowing else self._keys
+
+        matches = self._search(candidates, query) if query else None
+        self.query = query
+
+        # Refiltering costs a Python call per row, skip it when the same
+        # rows are shown, as while typing a word common to all titles
+        if matches == self._matches:
+            return
+
+        self._matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, row, parent):
+
+        return self._matches is None or \
+            id(self._listIcons[row]) in self._matches
+
+
+# Undoable edits of an IconTableModel. Each command keeps only what it
+# changes, the row and the entry or value, and goes through the model
+# methods so that undoing signals just the rows involved.
+
+class InsertIconCommand(QUndoCommand):
+
+    def __init__(self, model, row, entry):
+
+        super(InsertIconCommand, self).__init__("Add '%s'" % entry.title)
+        self.model = model
+        self.row = row
+        self.entry = entry
+
+    def redo(self):
+        self.model.insertIcon(self.row, self.entry)
+
+    def undo(self):
+        self.model.removeIcon(self.row)
+
+
+class RemoveIconCommand(QUndoCommand):
+
+    def __init__(self, model, row):
+
+        # The entry object itself is put back on undo, so that it finds its
+        # block in the config document again
+        self.entry = model.listIcons[row]
+        super(RemoveIconCommand, self).__init__("Delete '%s'"
+            % self.entry.title)
+        self.model = model
+        self.row = row
+
+    def redo(self):
+        self.model.removeIcon(self.row)
+
+    def undo(self):
+        self.model.insertIcon(self.row, self.entry)
+
+
+class ReplaceIconCommand(QUndoCommand):
+
+    def __init__(self, model, row, entry):
+
+        super(ReplaceIconCommand, self).__init__("Edit '%s'" % entry.title)
+        self.model = model
+        self.row = row
+        self.old = IconEntry(*model.listIcons[row].values())
+        self.new = entry
+
+    def redo(self):
+        self.model.replaceIcon(self.row, self.new)
+
+    def undo(self):
+        self.model.replaceIcon(self.row, self.old)
+
+
+class SetIconFieldCommand(QUndoCommand):
+
+    def __init__(self, model, row, column, value):
+
+        super(SetIconFieldCommand, self).__init__("Edit %s"
+            % model.columns[column])
+        self.model = model
+        self.row = row
+        self.column = column
+        self.old = getattr(model.listIcons[row], model.columns[column])
+        self.new = value
+
+    def redo(self):
+        self.model.setField(self.row, self.column, self.new)
+
+    def undo(self):
+        self.model.setField(self.row, self.column, self.old)
+
+
+class MoveIconCommand(QUndoCommand):
+
+    def __init__(self, model, row, dest):
+
+        super(MoveIconCommand, self).__init__("Move '%s'"
+            % model.listIcons[row].title)
+        self.model = model
+        self.row = row
+        self.dest = dest
+
+    def redo(self):
+        self.model.moveIcon(self.row, self.dest)
+
+    def undo(self):
+        self.model.moveIcon(self.dest, self.row)
+
+
+class RemoveIconsCommand(QUndoCommand):
+
+    def __init__(self, model, rows):
+
+        super(RemoveIconsCommand, self).__init__("Delete %d icons"
+            % len(rows))
+        self.model = model
+        self.rows = sorted(rows)
+        self.entries = [model.listIcons[row] for row in self.rows]
+
+    def redo(self):
+        self.model.removeIcons(self.rows)
+
+    def undo(self):
+        self.model.insertIcons(self.rows, self.entries)
+
+
+class AddIconsCommand(QUndoCommand):
+
+    def __init__(self, model, row, entries):
+
+        super(AddIconsCommand, self).__init__("Add %d icons" % len(entries))
+        self.model = model
+        self.rows = list(range(row, row + len(entries)))
+        self.entries = list(entries)
+
+    def redo(self):
+        self.model.insertIcons(self.rows, self.entries)
+
+    def undo(self):
+        self.model.removeIcons(self.rows)
+
+
+class MoveIconsCommand(QUndoCommand):
+
+    # The rows are taken out and put back as a block at position dest of the
+    # remaining rows. Only the rows and dest are kept, the order of the
+    # whole list is computed when needed.
+    def __init__(self, model, rows, dest):
+
+        super(MoveIconsCommand, self).__init__("Move %d icons" % len(rows))
+        self.model = model
+        self.rows = sorted(rows)
+        self.dest = dest
+
+    def order(self):
+
+        moved = set(self.rows)
+        rest = [row for row in range(len(self.model.listIcons))
+            if row not in moved]
+
+        return rest[:self.dest] + self.rows + rest[self.dest:]
+
+    def isNoop(self):
+        return self.order() == list(range(len(self.model.listIcons)))
+
+    def redo(self):
+        self.model.reorder(self.order())
+
+    def undo(self):
+
+        order = self.order()
+        inverse = [0] * len(order)
+        for new, old in enumerate(order):
+            inverse[old] = new
+
+        self.model.reorder(inverse)
+
+
+class IconDelegate(QStyledItemDelegate):
+    """Paints the thumbnail of the icon column. Only rows the view paints
+    are requested, and the images are decoded off the GUI thread; a
+    placeholder is painted until they arrive."""
+
+    # The pixmaps of the rows painted last, the ones scrolled away long ago
+    # come back from the thumbnail cache
+    maxPixmaps = 512
+
+    def __init__(self, size = 30, *args, **kwargs):
+
+        super(IconDelegate, self).__init__(*args, **kwargs)
+        self.size = size
+        self.view = None
+        self._pixmaps = OrderedDict()
+
+        self.loader = ThumbnailLoader(parent = self)
+        self.loader.loaded.connect(self._onLoaded)
+
+    def attach(self, view):
+
+        # Drop the pending decodes of rows that are scrolled away or deleted
+        self.view = view
+        view.verticalScrollBar().valueChanged.connect(self.cancelHidden)
+
+        model = view.model()
+        model.rowsRemoved.connect(self.cancelHidden)
+        model.modelReset.connect(self.cancelHidden)
+
+    def cancelHidden(self, *args):
+
+        if self.view is not None:
+            self.loader.cancelHidden(self.view, IconPathRole)
+
+    def _onLoaded(self, path, width, height, image):
+
+        self._pixmaps[path] = QPixmap.fromImage(image)
+        if len(self._pixmaps) > self.maxPixmaps:
+            self._pixmaps.popitem(last = False)
+
+        if self.view is not None:
+            self.view.viewport().update()
+
+    def placeholder(self, option):
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        return style.standardIcon(QStyle.SP_FileIcon).pixmap(self.size // 2)
+
+    def thumbnail(self, path):
+
+        pixmap = self._pixmaps.get(path)
+
+        if pixmap is None:
+            self.loader.request(path, self.size, self.size)
+        else:
+            self._pixmaps.move_to_end(path)
+
+        return pixmap
+
+    def paint(self, painter, option, index):
+
+        path = index.data(IconPathRole)
+        if path is None:
+            return super(IconDelegate, self).paint(painter, option, index)
+
+        # Background and selection highlight
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter,
+                option.widget)
+
+        pixmap = self.thumbnail(path)
+        if pixmap is None:
+            pixmap = self.placeholder(option)
+
+        if not pixmap.isNull():
+            x = option.rect.x() + (option.rect.width() - pixmap.width()) // 2
+            y = option.rect.y() + (option.rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+
+    def sizeHint(self, option, index):
+
+        if index.data(IconPathRole) is None:
+            return super(IconDelegate, self).sizeHint(option, index)
+
+        return QSize(self.size, self.size)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Resolves icon names, like the Icon= key of a .desktop file, to image files
+# of the installed icon themes. The theme directories are listed once into
+# an index kept on disk; later runs only stat the directories and list again
+# the ones whose mtime changed.
+
+import os
+import re
+import bisect
+
+from wbarconfig import cachePath, dataDirs, loadIndex, saveIndex
+
+# The formats wbar loads, scalable svg icons are left out
+ICON_EXTS = ('.png', '.xpm', '.jpg', '.jpeg')
+
+# 48x48, 48x48@2 and 48 directories give the size of their icons
+SIZE_DIR = re.compile(r'^(\d+)(x\d+)?(@\d+)?$')
+
+
+def iconDirs():
+    """The base directories of the icon themes, the user's ones first."""
+
+    return [os.path.join(os.path.expanduser('~'), '.icons')] + \
+        [os.path.join(direc, 'icons') for direc in dataDirs()]
+
+
+class IconThemeIndex(object):
+    """theme -> name -> [(size, path)] of the icon theme trees, with the
+    images of the pixmaps directories under the theme ''. resolve() picks
+    the best size for the dock with a binary search over the few sizes of a
+    name, whatever the number of icons installed."""
+
+    indexVersion = 1
+
+    def __init__(self, baseDirs = None, pixmapDirs = ('/usr/share/pixmaps',),
+            indexFile = None):
+
+        self.baseDirs = baseDirs or iconDirs()
+        self.pixmapDirs = list(pixmapDirs)
+        self.indexFile = indexFile or cachePath('icons.json')
+
+        # directory -> [mtime, image names, subdirectories]
+        self._dirs = None
+        self._dirty = False
+
+        # theme -> name -> sorted [(size, path)], built by refresh()
+        self._themes = None
+        self._inherits = {}
+
+    def save(self):
+
+        if self._dirty and saveIndex(self.indexFile, self.indexVersion,
+                self._dirs):
+            self._dirty = False
+
+    def _scan(self, direc, seen, parents = frozenset()):
+
+        try:
+            st = os.stat(direc)
+        except OSError:
+            return
+
+        # A symbolic link back to a directory above, a cycle
+        inode = (st.st_dev, st.st_ino)
+        if inode in parents:
+            return
+
+        seen.add(direc)
+        mtime = int(st.st_mtime)
+        cached = self._dirs.get(direc)
+
+        # A file or directory added or removed changes the mtime, so an
+        # unchanged directory is not listed again
+        if cached is None or cached[0] != mtime:
+            names = []
+            subdirs = []
+            try:
+                entries = list(os.scandir(direc))
+            except OSError:
+                entries = []
+
+            for entry in entries:
+                try:
+                    isDir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if isDir:
+                    subdirs.append(entry.name)
+                elif entry.name.lower().endswith(ICON_EXTS):
+                    names.append(entry.name)
+
+            cached = self._dirs[direc] = [mtime, sorted(names),
+                sorted(subdirs)]
+            self._dirty = True
+
+        parents = parents | {inode}
+        for name in cached[2]:
+            self._scan(os.path.join(direc, name), seen, parents)
+
+    def refresh(self):
+        """Bring the index up to date with the directories and build the
+        lookup tables."""
+
+        if self._dirs is None:
+            self._dirs = loadIndex(self.indexFile, self.indexVersion)
+
+        seen = set()
+        for direc in self.baseDirs + self.pixmapDirs:
+            self._scan(direc, seen)
+
+        for direc in set(self._dirs) - seen:
+            del self._dirs[direc]
+            self._dirty = True
+
+        self._themes = {}
+        for direc, (mtime, names, subdirs) in self._dirs.items():
+            if not names:
+                continue
+
+            theme, size = self._themeSize(direc)
+            if theme is None:
+                continue
+
+            icons = self._themes.setdefault(theme, {})
+            for name in names:
+                stem = os.path.splitext(name)[0]
+                icons.setdefault(stem, []).append((size,
+                    os.path.join(direc, name)))
+
+        for icons in self._themes.values():
+            for sizes in icons.values():
+                sizes.sort()
+
+        self._inherits = {}
+
+    def _themeSize(self, direc):
+
+        for base in self.pixmapDirs:
+            if direc == base or direc.startswith(base + os.sep):
+                return '', 0
+
+        for base in self.baseDirs:
+            if direc.startswith(base + os.sep):
+                parts = os.path.relpath(direc, base).split(os.sep)
+                break
+        else:
+            return None, 0
+
+        # Images right in the base directory are not part of a theme
+        if len(parts) < 2:
+            return None, 0
+
+        # theme/48x48/apps and theme/apps/48 both occur
+        for part in parts[1:]:
+            match = SIZE_DIR.match(part)
+            if match:
+                return parts[0], int(match.group(1))
+
+        return parts[0], 0
+
+    def inherits(self, theme):
+        """The Inherits= themes of the index.theme of a theme."""
+
+        if theme not in self._inherits:
+            parents = []
+            for base in self.baseDirs:
+                path = os.path.join(base, theme, 'index.theme')
+                try:
+                    with open(path, 'r', encoding = 'utf-8',
+                            errors = 'replace') as fh:
+                        for line in fh:
+                            if line.startswith('Inherits='):
+                                parents = [t.strip() for t in
+                                    line[9:].split(',') if t.strip()]
+                                break
+                except OSError:
+                    continue
+                break
+
+            self._inherits[theme] = parents
+
+        return self._inherits[theme]
+
+    def themeChain(self, theme):
+        """The theme, the ones it inherits from and hicolor, in lookup
+        order."""
+
+        chain = []
+        pending = [theme] if theme else []
+        while pending:
+            name = pending.pop(0)
+            if name not in chain:
+                chain.append(name)
+                pending.extend(self.inherits(name))
+
+        if 'hicolor' not in chain:
+            chain.append('hicolor')
+
+        return chain
+
+    @staticmethod
+    def bestSize(sizes, size):
+
+        # The smallest image not smaller than the dock icons, scaling down
+        # looks better than scaling up, otherwise the largest one
+        pos = bisect.bisect_left(sizes, (size, ''))
+        return sizes[pos] if pos < len(sizes) else sizes[-1]
+
+    def resolve(self, name, size, theme = None):
+        """Return the image file for an icon name at the given size, the
+        name itself if it is a path to a file, or '' if there is none."""
+
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else ''
+
+        if self._themes is None:
+            self.refresh()
+
+        name = os.path.splitext(name)[0] if name.lower().endswith(
+            ICON_EXTS) else name
+
+        for themeName in self.themeChain(theme) + ['']:
+            sizes = self._themes.get(themeName, {}).get(name)
+            if sizes:
+                return self.bestSize(sizes, size)[1]
+
+        return ''
+
+    def names(self):
+        """All the icon names, for completion."""
+
+        if self._themes is None:
+            self.refresh()
+
+        return sorted(set(name for icons in self._themes.values()
+            for name in icons))
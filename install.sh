@@ -8,6 +8,19 @@ desktop_direc='/usr/local/share/applications'
 # Install script and local icons
 sudo mkdir -p "${install_direc}"
 sudo cp filedialogpreview.py "${install_direc}"
+sudo cp wbarconfig.py "${install_direc}"
+sudo cp iconmodel.py "${install_direc}"
+sudo cp thumbnailcache.py "${install_direc}"
+sudo cp wbarreload.py "${install_direc}"
+sudo cp wbartrace.py "${install_direc}"
+sudo cp fontcatalog.py "${install_direc}"
+sudo cp fontspecimen.py "${install_direc}"
+sudo cp dockpreview.py "${install_direc}"
+sudo cp desktopentries.py "${install_direc}"
+sudo cp icontheme.py "${install_direc}"
+sudo cp wbarcli.py "${install_direc}"
+sudo cp wbarvalidate.py "${install_direc}"
+sudo cp wbardialog.py "${install_direc}"
 sudo cp wbar-settings.py "${install_direc}"
 sudo cp -R icons/ "${install_direc}"
 sudo chmod 755 "${install_direc}"/*.py
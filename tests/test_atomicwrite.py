@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+
+import os
+import sys
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wbarconfig
+from wbarconfig import atomicWrite, rotateBackups
+
+class AtomicWriteTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.direc = self.tmpdir.name
+        self.path = os.path.join(self.direc, '.wbar')
+        with open(self.path, 'w') as fh:
+            fh.write('old\n')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def text(self, path = None):
+
+        with open(path or self.path) as fh:
+            return fh.read()
+
+    def test_mode_is_kept(self):
+
+        os.chmod(self.path, 0o640)
+        atomicWrite(self.path, 'new\n')
+
+        self.assertEqual(self.text(), 'new\n')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_new_file_mode(self):
+
+        path = os.path.join(self.direc, 'new')
+        umask = os.umask(0o022)
+        try:
+            atomicWrite(path, 'new\n')
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+    def test_symlink_is_kept(self):
+
+        link = os.path.join(self.direc, 'link')
+        os.symlink(self.path, link)
+        atomicWrite(link, 'new\n')
+
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(self.text(), 'new\n')
+
+    def test_failed_write_leaves_no_temporary_file(self):
+
+        with mock.patch.object(wbarconfig.os, 'replace',
+                side_effect = OSError('disk full')):
+            with self.assertRaises(OSError):
+                atomicWrite(self.path, 'new\n')
+
+        self.assertEqual(os.listdir(self.direc), ['.wbar'])
+        self.assertEqual(self.text(), 'old\n')
+
+    def test_backups(self):
+
+        for i in range(5):
+            atomicWrite(self.path, 'version %d\n' % i, backups = 3)
+
+        self.assertEqual(sorted(os.listdir(self.direc)),
+            ['.wbar', '.wbar.1', '.wbar.2', '.wbar.3'])
+        self.assertEqual(self.text(), 'version 4\n')
+        self.assertEqual([self.text('%s.%d' % (self.path, i))
+            for i in (1, 2, 3)], ['version 3\n', 'version 2\n', 'version 1\n'])
+
+    def test_backup_is_not_the_config(self):
+
+        # The newest backup may be a hard link, the write must not change it
+        rotateBackups(self.path, 2)
+        atomicWrite(self.path, 'new\n')
+
+        self.assertEqual(self.text(self.path + '.1'), 'old\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
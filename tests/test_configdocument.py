@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wbarconfig import ConfigDocument, IconEntry
+
+CONFIG = '''# wbar config
+i: /usr/share/pixmaps/wbar/dock.png
+c: wbar --bpress --custom 3 --isize 32
+t: /usr/share/fonts/Mono/12
+
+# Browser
+i: /usr/share/pixmaps/firefox.png
+c: firefox
+t: Firefox
+x: an unknown line
+
+i: /usr/share/pixmaps/xterm.png
+# inside a block
+c: xterm
+t: Terminal
+
+
+i: /usr/share/pixmaps/gimp.png
+c: gimp
+t: Gimp
+# the end
+'''
+
+
+class ConfigDocumentTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, '.wbar')
+        with open(self.path, 'w') as fh:
+            fh.write(CONFIG)
+
+        # Far in the past, so that any write shows
+        os.utime(self.path, (1, 1))
+
+        self.document = ConfigDocument.read(self.path)
+        self.barSettings = self.document.barSettings()
+        self.listIcons = self.document.icons()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def save(self):
+        return self.document.save(self.path, self.barSettings,
+            self.listIcons)
+
+    def text(self):
+
+        with open(self.path) as fh:
+            return fh.read()
+
+    def test_parse(self):
+
+        self.assertEqual(self.barSettings.command,
+            'wbar --bpress --custom 3 --isize 32')
+        self.assertEqual((self.barSettings.font, self.barSettings.fontSize),
+            ('/usr/share/fonts/Mono', 12))
+        self.assertEqual([entry.title for entry in self.listIcons],
+            ['Firefox', 'Terminal', 'Gimp'])
+        self.assertEqual(self.listIcons[1].command, 'xterm')
+
+    def test_unchanged_is_not_written(self):
+
+        self.assertEqual(self.save(), 0)
+        self.assertEqual(os.stat(self.path).st_mtime, 1)
+        self.assertEqual(self.document.text(), CONFIG)
+
+    def test_edit_keeps_other_lines(self):
+
+        self.listIcons[0].title = 'Web'
+        self.assertEqual(self.save(), 1)
+        self.assertEqual(self.text(), CONFIG.replace('t: Firefox', 't: Web'))
+
+        # The document follows the file, saving again writes nothing
+        self.assertEqual(self.save(), 0)
+
+    def test_edit_inside_commented_block(self):
+
+        self.listIcons[1].command = 'urxvt'
+        self.save()
+        self.assertEqual(self.text(), CONFIG.replace('c: xterm', 'c: urxvt'))
+
+    def test_reorder(self):
+
+        self.listIcons.reverse()
+        self.assertEqual(self.save(), 2)
+
+        document = ConfigDocument.read(self.path)
+        self.assertEqual([entry.title for entry in document.icons()],
+            ['Gimp', 'Terminal', 'Firefox'])
+
+        # The comments and unknown lines move with their blocks
+        text = self.text()
+        self.assertLess(text.index('# Browser'), text.index('t: Firefox'))
+        self.assertLess(text.index('t: Firefox'), text.index('x: an unknown'))
+        self.assertLess(text.index('# inside a block'), text.index('c: xterm'))
+        self.assertTrue(text.startswith('# wbar config\n'))
+
+    def test_insert_and_delete(self):
+
+        del self.listIcons[1]
+        self.listIcons.insert(0, IconEntry('/usr/share/pixmaps/vim.png',
+            'gvim', 'Vim'))
+        self.assertEqual(self.save(), 2)
+
+        text = self.text()
+        self.assertNotIn('xterm', text)
+        self.assertNotIn('# inside a block', text)
+        self.assertIn('\ni: /usr/share/pixmaps/vim.png\nc: gvim\nt: Vim\n',
+            text)
+
+        document = ConfigDocument.read(self.path)
+        self.assertEqual([entry.title for entry in document.icons()],
+            ['Vim', 'Firefox', 'Gimp'])
+        self.assertTrue(text.endswith('t: Gimp\n# the end\n'))
+
+    def test_new_file(self):
+
+        path = os.path.join(self.tmpdir.name, 'new.wbar')
+        document = ConfigDocument()
+        self.assertEqual(document.save(path, self.barSettings,
+            self.listIcons[:1]), 2)
+
+        document = ConfigDocument.read(path)
+        self.assertEqual(document.barSettings(), self.barSettings)
+        self.assertEqual(document.icons(), self.listIcons[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
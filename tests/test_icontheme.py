@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from icontheme import IconThemeIndex
+
+
+class IconThemeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.tmpdir.name, 'icons')
+        self.apps = os.path.join(self.base, 'theme', '48x48', 'apps')
+        os.makedirs(self.apps)
+        open(os.path.join(self.apps, 'editor.png'), 'w').close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def index(self):
+        return IconThemeIndex([self.base], (), os.path.join(self.tmpdir.name,
+            'icons.json'))
+
+    def test_symlink_cycles(self):
+
+        theme = os.path.join(self.base, 'theme')
+        os.symlink('..', os.path.join(self.apps, 'up'))
+        os.symlink('loop', os.path.join(theme, 'loop'))
+
+        self.assertEqual(self.index().resolve('editor', 48, 'theme'),
+            os.path.join(self.apps, 'editor.png'))
+
+    def test_linked_size_directory(self):
+
+        # Themes link the directories of sizes that share their images
+        os.makedirs(os.path.join(self.base, 'theme', '32x32'))
+        os.symlink(os.path.join('..', '48x48', 'apps'), os.path.join(
+            self.base, 'theme', '32x32', 'apps'))
+
+        self.assertEqual(self.index().resolve('editor', 32, 'theme'),
+            os.path.join(self.base, 'theme', '32x32', 'apps', 'editor.png'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wbarcli
+
+CONFIG = '''i: /usr/share/pixmaps/wbar/dock.png
+c: wbar --bpress --isize 32 --zoomf 1.8
+t: /usr/share/fonts/truetype/liberation/LiberationMono-Regular/12
+
+i: /usr/share/pixmaps/xterm.png
+c: xterm
+t: Terminal
+'''
+
+
+class CliTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmpdir.name, '.wbar')
+        with open(self.config, 'w') as fh:
+            fh.write(CONFIG)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def runCli(self, *args):
+
+        out = io.StringIO()
+        with redirect_stderr(io.StringIO()):
+            status = wbarcli.main(['wbar-settings'] + list(args) +
+                ['-c', self.config], out)
+
+        return status, out.getvalue().splitlines()
+
+    def text(self):
+
+        with open(self.config) as fh:
+            return fh.read()
+
+    def test_get_both_spellings(self):
+
+        for args in (('zoomf',), ('--zoomf',)):
+            self.assertEqual(self.runCli('get', *args), (0, ['1.8']))
+
+        self.assertEqual(self.runCli('get', '--isize', 'zoomf', '--bpress'),
+            (0, ['32', '1.8', '--bpress']))
+
+    def test_get_missing_option(self):
+        self.assertEqual(self.runCli('get', '--vbar')[0], 1)
+
+    def test_set(self):
+
+        self.assertEqual(self.runCli('set', '--zoomf', '2.0', '--vbar',
+            '--no-bpress')[0], 0)
+        self.assertEqual(self.runCli('get', 'zoomf', 'vbar'),
+            (0, ['2.0', '--vbar']))
+        self.assertEqual(self.runCli('get', 'bpress')[0], 1)
+
+    def test_set_rejects_bad_values(self):
+
+        for args in (('--zoomf', 'abc'), ('--zoomf',), ('--offset', '-5'),
+                ('--bogus', '1'), ('--no-bogus',), ('--vbar', '3'),
+                ('--pos', 'middle'), ('--fc', 'red'),
+                ('--zoomf', '2.0', '--isize', '33')):
+            status, lines = self.runCli('set', *args)
+            self.assertEqual(status, 2, args)
+            self.assertEqual(self.text(), CONFIG, args)
+
+
+if __name__ == '__main__':
+    unittest.main()
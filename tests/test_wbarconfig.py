@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wbarconfig import (OPTIONS, SCREEN_POSITIONS, ICON_SIZES, FILTER_MODES,
+    WbarCommand, commandLine, optionValues, BarSettings, IconEntry,
+    ConfigDocument, loadIndex, saveIndex, dataDirs)
+
+# flag -> OptionEnum of the choice options
+ENUMS = (('--pos', SCREEN_POSITIONS), ('--isize', ICON_SIZES),
+    ('--filter', FILTER_MODES))
+
+
+class OptionEnumTest(unittest.TestCase):
+
+    def test_schema_uses_enums(self):
+
+        for flag, enum in ENUMS:
+            self.assertIs(OPTIONS[flag].values, enum)
+
+    def test_round_trip(self):
+
+        for flag, enum in ENUMS:
+            for index, value in enumerate(enum):
+                label = enum.label(value)
+                self.assertEqual(enum.value(label), value)
+                self.assertEqual(enum.index(enum.value(label)), index)
+                self.assertEqual(enum[index], value)
+                self.assertIn(value, enum)
+
+    def test_labels(self):
+
+        self.assertEqual([FILTER_MODES.label(v) for v in FILTER_MODES],
+            ['none', 'hovered', 'others', 'all'])
+        self.assertEqual(SCREEN_POSITIONS.label('top'), 'top')
+        self.assertNotIn('middle', SCREEN_POSITIONS)
+
+    def test_command_line_round_trip(self):
+
+        for flag, enum in ENUMS:
+            for value in enum:
+                values = {'--bpress': None, flag: value, '--zoomf': '1.8'}
+                command = WbarCommand(commandLine('wbar', values))
+                self.assertEqual(optionValues(command), values)
+                self.assertEqual(enum.index(command.get(flag)),
+                    enum.index(value))
+
+
+class BarSettingsTest(unittest.TestCase):
+
+    def test_font_line_round_trip(self):
+
+        for title, font, size in (
+                ('/usr/share/fonts/Mono/12', '/usr/share/fonts/Mono', 12),
+                ('/usr/share/fonts/Mono', '/usr/share/fonts/Mono', None),
+                ('Mono', 'Mono', None), ('', '', None)):
+            barSettings = BarSettings.fromBlock(IconEntry('', 'wbar', title))
+            self.assertEqual((barSettings.font, barSettings.fontSize),
+                (font, size))
+            self.assertEqual(barSettings.fontLine(), title)
+
+    def test_save_keeps_font_line(self):
+
+        text = ('i: /usr/share/pixmaps/wbar/dock.png\nc: wbar --isize 32\n'
+            't: /usr/share/fonts/Mono\n\ni: /x.png\nc: xterm\nt: Term\n')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, '.wbar')
+            with open(path, 'w') as fh:
+                fh.write(text)
+
+            document = ConfigDocument.read(path)
+            barSettings = document.barSettings()
+            listIcons = document.icons()
+
+            # The dock block is written again with its font line
+            barSettings.command = 'wbar --isize 48'
+            document.save(path, barSettings, listIcons)
+
+            with open(path) as fh:
+                self.assertEqual(fh.read(), text.replace('32', '48'))
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def test_round_trip(self):
+
+        dirs = {'/usr/share/icons': [12, ['a.png'], []]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'cache', 'index.json')
+            self.assertEqual(loadIndex(path, 1), {})
+
+            self.assertTrue(saveIndex(path, 1, dirs))
+            self.assertEqual(loadIndex(path, 1), dirs)
+
+            # Another version is as good as no index
+            self.assertEqual(loadIndex(path, 2), {})
+
+            with open(path, 'w') as fh:
+                fh.write('{"version": 1, "dirs"')
+            self.assertEqual(loadIndex(path, 1), {})
+
+    def test_unwritable(self):
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'file', 'index.json')
+            open(os.path.join(tmpdir, 'file'), 'w').close()
+            self.assertFalse(saveIndex(path, 1, {}))
+
+    def test_data_dirs(self):
+
+        with mock.patch.dict(os.environ, {'XDG_DATA_HOME': '/home/u/data',
+                'XDG_DATA_DIRS': '/opt/share::/usr/share'}):
+            self.assertEqual(dataDirs(), ['/home/u/data', '/opt/share',
+                '/usr/share'])
+
+        with mock.patch.dict(os.environ, {'XDG_DATA_HOME': '',
+                'XDG_DATA_DIRS': ''}):
+            self.assertEqual(dataDirs()[1:], ['/usr/local/share',
+                '/usr/share'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Usage: python3 -m unittest discover tests
+#
+# The docks are the stub tools/wbar, under a process name of their own so
+# that a real wbar of the user is never signalled.
+
+import os
+import sys
+import time
+import signal
+import tempfile
+import unittest
+import subprocess
+from unittest import mock
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repoDir)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from wbarreload import WbarReloader, findProcesses
+
+STUB = os.path.join(repoDir, 'tools', 'wbar')
+
+# At most 15 characters, the length /proc keeps
+NAME = 'wbartest%d' % (os.getpid() % 100000)
+
+
+class ReloadTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logFile = os.path.join(self.tmpdir.name, 'stub.log')
+        self.env = mock.patch.dict(os.environ, {'WBAR_STUB_LOG': self.logFile,
+            'WBAR_STUB_NAME': NAME})
+        self.env.start()
+
+        self.command = '%s %s --isize 32' % (sys.executable, STUB)
+        self.procs = []
+        self.reloaders = []
+
+    def tearDown(self):
+
+        for pid in findProcesses(NAME):
+            os.kill(pid, signal.SIGKILL)
+        for proc in self.procs + [proc for reloader in self.reloaders
+                for proc in reloader._children]:
+            proc.wait()
+
+        self.env.stop()
+        self.tmpdir.cleanup()
+
+    def log(self):
+
+        try:
+            with open(self.logFile) as fh:
+                return [line.split(' ', 1) for line in fh.read().splitlines()]
+        except OSError:
+            return []
+
+    def waitFor(self, test, timeout = 5.0):
+
+        deadline = time.monotonic() + timeout
+        while not test():
+            if time.monotonic() > deadline:
+                self.fail('timed out, log: %r' % self.log())
+            time.sleep(0.02)
+
+    def startStub(self, **env):
+
+        proc = subprocess.Popen([sys.executable, STUB], env = dict(
+            os.environ, **env))
+        self.procs.append(proc)
+        self.waitFor(lambda: [str(proc.pid), 'start \n'] in [[pid, text +
+            '\n'] for pid, text in self.log()])
+
+        return proc
+
+    def reloader(self, reloadSignal = None):
+
+        reloader = WbarReloader(NAME, reloadSignal)
+        self.reloaders.append(reloader)
+
+        return reloader
+
+    def test_find_processes(self):
+
+        proc = self.startStub()
+        self.assertEqual(findProcesses(NAME), [proc.pid])
+        self.assertEqual(findProcesses(NAME, os.getuid() + 1), [])
+
+        proc.terminate()
+        proc.wait()
+        self.assertEqual(findProcesses(NAME), [])
+
+    def test_not_running(self):
+        self.assertEqual(self.reloader().reload(self.command), [])
+
+    def test_signal(self):
+
+        proc = self.startStub()
+        reloader = self.reloader(signal.SIGUSR1)
+        self.assertEqual(reloader.reload(self.command), [proc.pid])
+
+        self.waitFor(lambda: [str(proc.pid), 'signal SIGUSR1'] in self.log())
+        self.assertEqual(findProcesses(NAME), [proc.pid])
+
+    def test_restart(self):
+
+        old = self.startStub()
+        reloader = self.reloader()
+        new = reloader.reload(self.command, '/tmp/x.wbar')
+
+        # The old dock is gone before the new one starts
+        self.assertEqual(old.poll(), 0)
+        self.assertNotIn(old.pid, new)
+        self.waitFor(lambda: [str(new[0]), 'start --isize 32 --config '
+            '/tmp/x.wbar'] in self.log())
+        self.assertEqual(findProcesses(NAME), new)
+
+    def test_restart_kills_a_stuck_dock(self):
+
+        old = self.startStub(WBAR_STUB_STUBBORN = '1')
+        reloader = self.reloader()
+        reloader.exitTimeout = 0.2
+        new = reloader.reload(self.command)
+
+        self.assertEqual(old.poll(), -signal.SIGKILL)
+        self.assertIn([str(old.pid), 'signal SIGTERM'], self.log())
+        self.waitFor(lambda: findProcesses(NAME) == new)
+
+    def test_start_failure(self):
+
+        self.startStub()
+        with self.assertRaises(OSError):
+            self.reloader().reload('/nonexistent/wbar')
+
+
+class LiveApplyTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        from PyQt5.QtWidgets import QApplication
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+
+        from wbardialog import WbarDialog
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = os.path.join(self.tmpdir.name, '.wbar')
+        with open(self.config, 'w') as fh:
+            fh.write('i: /x.png\nc: wbar --isize 32 --idist 5\nt: /f/12\n\n'
+                'i: /y.png\nc: xterm\nt: Terminal\n')
+
+        self.window = WbarDialog(self.config)
+        self.window.show()
+        while not self.window.configRead:
+            self.app.processEvents()
+
+        self.window.ensureTabs()
+        self.window.applyTimer.setInterval(50)
+        self.window.applyLiveCheckBox.setChecked(True)
+        self.window.reloader = mock.Mock()
+        self.window.reloader.reload.return_value = [1]
+
+    def tearDown(self):
+
+        self.window.hide()
+        self.window.deleteLater()
+        self.app.processEvents()
+        self.tmpdir.cleanup()
+
+    def settle(self):
+
+        deadline = time.monotonic() + 2
+        while self.window.applyTimer.isActive() and \
+                time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def test_edits_are_applied_once(self):
+
+        spinBox = self.window.optionWidgets['--idist'][1]
+        for value in (6, 7, 8, 9):
+            spinBox.setValue(value)
+            self.app.processEvents()
+
+        self.settle()
+
+        self.assertEqual(self.window.reloader.reload.call_count, 1)
+        command = self.window.reloader.reload.call_args[0][0]
+        self.assertIn('--idist 9', command)
+
+    def test_start_failure_is_shown(self):
+
+        self.window.reloader.reload.side_effect = FileNotFoundError(2,
+            'No such file or directory')
+        self.window.optionWidgets['--idist'][1].setValue(6)
+        self.settle()
+
+        self.assertIn('Cannot start wbar',
+            self.window.statusBar.currentMessage())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from PyQt5.QtCore import (Qt, QPoint, QObject, QRunnable, QThreadPool,
+    pyqtSignal)
+from PyQt5.QtGui import QImage, QImageReader
+from wbarconfig import cacheHome
+from wbartrace import span
+
+# Thumbnail sizes of the freedesktop thumbnail spec
+# https://specifications.freedesktop.org/thumbnail-spec/latest/
+SPEC_SIZES = (('normal', 128), ('large', 256), ('x-large', 512),
+    ('xx-large', 1024))
+
+
+class ThumbnailCache(object):
+    """Scaled images of icon files, kept in a small in-memory LRU backed by
+    the freedesktop thumbnail directory on disk. Entries are keyed by path,
+    mtime, file size and target size so an edited image is picked up.
+    With saveThumbnails False the thumbnails on disk are read but never
+    written. image() may be called from worker threads."""
+
+    def __init__(self, maxItems = 512, thumbnailDir = None,
+                 saveThumbnails = True):
+
+        self.maxItems = maxItems
+        self.thumbnailDir = thumbnailDir or os.path.join(cacheHome(),
+            'thumbnails')
+        self.saveThumbnails = saveThumbnails
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters: memory hits, disk hits and full decodes
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def stats(self):
+        return 'thumbnails: %d hits, %d disk hits, %d misses' % (self.hits,
+            self.diskHits, self.misses)
+
+    def _key(self, path, width, height):
+
+        try:
+            st = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None, None
+
+        return (path, int(st.st_mtime), st.st_size, width, height), st
+
+    def cached(self, path, width, height):
+        """Return the image if it is in memory, otherwise None. Never
+        decodes, so it is cheap enough for the GUI thread."""
+
+        key = self._key(path, width, height)[0]
+        if key is None:
+            return None
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+
+        return image
+
+    def image(self, path, width, height):
+
+        key, st = self._key(path, width, height)
+        if key is None:
+            return QImage()
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+        with span('thumbnail.load'):
+            image = self._loadThumbnail(path, st, width, height)
+
+        if image.isNull():
+            with span('thumbnail.decode'):
+                image = self._decode(path, self._specSize(width, height)[1])
+            if image.isNull():
+                return image
+
+            if self.saveThumbnails:
+                with span('thumbnail.save'):
+                    self._saveThumbnail(path, st, image, width, height)
+            diskHit = False
+        else:
+            diskHit = True
+
+        with span('thumbnail.scale'):
+            image = self._scaled(image, width, height)
+
+        with self._lock:
+            if diskHit:
+                self.diskHits += 1
+            else:
+                self.misses += 1
+
+            self._images[key] = image
+            if len(self._images) > self.maxItems:
+                self._images.popitem(last = False)
+
+        return image
+
+    @staticmethod
+    def _decode(path, size):
+
+        # Large images are decoded at the thumbnail size only, which for
+        # jpeg skips most of the work
+        reader = QImageReader(path)
+        imageSize = reader.size()
+        if imageSize.isValid() and (imageSize.width() > size or
+                imageSize.height() > size):
+            reader.setScaledSize(imageSize.scaled(size, size,
+                Qt.KeepAspectRatio))
+
+        return reader.read()
+
+    @staticmethod
+    def _scaled(image, width, height):
+
+        if image.width() <= width and image.height() <= height:
+            return image
+
+        return image.scaled(width, height, Qt.KeepAspectRatio,
+            Qt.SmoothTransformation)
+
+    @staticmethod
+    def _specSize(width, height):
+
+        for name, size in SPEC_SIZES:
+            if max(width, height) <= size:
+                return name, size
+
+        return SPEC_SIZES[-1]
+
+    def _thumbnailPath(self, path, width, height):
+
+        uri = 'file://' + quote(os.path.abspath(path))
+        name = hashlib.md5(uri.encode('utf-8')).hexdigest() + '.png'
+        sizeName = self._specSize(width, height)[0]
+
+        return uri, os.path.join(self.thumbnailDir, sizeName, name)
+
+    def _loadThumbnail(self, path, st, width, height):
+
+        uri, thumbPath = self._thumbnailPath(path, width, height)
+
+        # Never thumbnail the thumbnails themselves
+        if os.path.abspath(path).startswith(self.thumbnailDir + os.sep):
+            return QImage()
+
+        image = QImage(thumbPath)
+        if image.isNull():
+            return image
+
+        if (image.text('Thumb::URI') != uri or
+                image.text('Thumb::MTime') != str(int(st.st_mtime))):
+            return QImage()
+
+        return image
+
+    def _saveThumbnail(self, path, st, image, width, height):
+
+        uri, thumbPath = self._thumbnailPath(path, width, height)
+        size = self._specSize(width, height)[1]
+
+        if os.path.abspath(path).startswith(self.thumbnailDir + os.sep):
+            return
+
+        thumb = self._scaled(image, size, size)
+        thumb.setText('Thumb::URI', uri)
+        thumb.setText('Thumb::MTime', str(int(st.st_mtime)))
+        thumb.setText('Thumb::Size', str(st.st_size))
+
+        # Write to a temporary file and rename it, as the spec asks, so no
+        # other reader sees a half written thumbnail.
+        thumbDir = os.path.dirname(thumbPath)
+        try:
+            os.makedirs(thumbDir, mode = 0o700, exist_ok = True)
+            fd, tmpPath = tempfile.mkstemp(suffix = '.png', dir = thumbDir)
+            os.close(fd)
+        except OSError:
+            return
+
+        if thumb.save(tmpPath, 'PNG'):
+            os.chmod(tmpPath, 0o600)
+            os.replace(tmpPath, thumbPath)
+        else:
+            os.unlink(tmpPath)
+
+
+class _LoaderSignals(QObject):
+
+    # QRunnable is not a QObject, so the jobs emit through this one
+    loaded = pyqtSignal(str, int, int, object)
+
+
+class _Ticket(object):
+
+    __slots__ = ('cancelled',)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+class _ThumbnailJob(QRunnable):
+
+    # The pool owns and deletes the job, the loader only keeps its ticket
+    def __init__(self, cache, signals, ticket, path, width, height):
+
+        super(_ThumbnailJob, self).__init__()
+
+        self.cache = cache
+        self.signals = signals
+        self.ticket = ticket
+        self.path = path
+        self.width = width
+        self.height = height
+
+    def run(self):
+
+        # Cancelled while still queued
+        if self.ticket.cancelled:
+            return
+
+        image = self.cache.image(self.path, self.width, self.height)
+
+        # The row may have gone away while the image was decoded
+        if not self.ticket.cancelled:
+            self.signals.loaded.emit(self.path, self.width, self.height,
+                image)
+
+
+class ThumbnailLoader(QObject):
+    """Decodes thumbnails on a thread pool and hands the QImage back to the
+    GUI thread through the 'loaded' signal. Cancelled requests are skipped
+    if they have not started yet and never delivered otherwise."""
+
+    loaded = pyqtSignal(str, int, int, QImage)
+
+    def __init__(self, cache = None, maxThreads = 4, *args, **kwargs):
+
+        super(ThumbnailLoader, self).__init__(*args, **kwargs)
+
+        self.cache = cache or sharedCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(maxThreads)
+
+        self._signals = _LoaderSignals(self)
+        self._signals.loaded.connect(self._onLoaded)
+
+        # (path, width, height) -> ticket of the request not yet delivered
+        self._pending = {}
+
+    def request(self, path, width, height):
+
+        key = (path, width, height)
+        if key in self._pending:
+            return
+
+        ticket = _Ticket()
+        self._pending[key] = ticket
+        self.pool.start(_ThumbnailJob(self.cache, self._signals, ticket,
+            path, width, height))
+
+    def pendingPaths(self):
+        return set(key[0] for key in self._pending)
+
+    def cancelHidden(self, view, role):
+        """Cancel the requests of the paths the view does not show, the
+        paths being the data under role of the first column. For the
+        delegates, when their view scrolls or loses rows."""
+
+        model = view.model()
+        first = view.indexAt(QPoint(0, 0)).row()
+        if first < 0:
+            visible = set()
+        else:
+            last = view.indexAt(QPoint(0, view.viewport().height() - 1)).row()
+            if last < 0:
+                last = model.rowCount() - 1
+
+            visible = set(model.index(row, 0).data(role)
+                for row in range(first, last + 1))
+
+        for key in list(self._pending):
+            if key[0] not in visible:
+                self.cancel(*key)
+
+    def cancel(self, path, width, height):
+
+        ticket = self._pending.pop((path, width, height), None)
+        if ticket is not None:
+            ticket.cancelled = True
+
+    def cancelAll(self):
+
+        for key in list(self._pending):
+            self.cancel(*key)
+
+    def _onLoaded(self, path, width, height, image):
+
+        ticket = self._pending.pop((path, width, height), None)
+        if ticket is None or ticket.cancelled:
+            return
+
+        self.loaded.emit(path, width, height, image)
+
+
+_sharedCache = None
+
+
+def sharedCache():
+    """The thumbnail cache shared by the icon tables."""
+
+    global _sharedCache
+    if _sharedCache is None:
+        _sharedCache = ThumbnailCache()
+
+    return _sharedCache
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Headless editing of wbar configs. Only the standard library and wbarconfig
+# are imported here, never PyQt5, so the commands run without a display and
+# start quickly enough to be called once per file from scripts.
+
+import os
+import sys
+import json
+import argparse
+
+from wbarconfig import (ConfigDocument, WbarCommand, BarSettings, IconEntry,
+    OPTIONS, checkOption)
+
+COMMANDS = ('get', 'set', 'add-icon', 'move', 'remove', 'export', 'validate')
+
+
+class CliError(Exception):
+    pass
+
+
+def defaultConfig():
+    return os.path.join(os.environ.get('HOME', ''), '.wbar')
+
+
+def newBarSettings():
+
+    # The defaults the dialog starts a new config with
+    barSettings = BarSettings()
+    barSettings.image = '/usr/share/pixmaps/wbar/dock.png'
+    barSettings.font = (
+        '/usr/share/fonts/truetype/liberation/LiberationMono-Regular')
+    barSettings.fontSize = 12
+
+    return barSettings
+
+
+def loadConfig(confFl):
+
+    document = ConfigDocument.read(confFl) if os.path.exists(confFl) \
+        else ConfigDocument()
+
+    return document, document.barSettings() or newBarSettings(), \
+        document.icons()
+
+
+def findIcon(listIcons, ref):
+    """Return the index of the icon given by its 1-based position or by its
+    title."""
+
+    if ref.isdigit():
+        row = int(ref) - 1
+        if 0 <= row < len(listIcons):
+            return row
+        raise CliError("no icon at position %s" % ref)
+
+    for row, entry in enumerate(listIcons):
+        if entry.title == ref:
+            return row
+
+    raise CliError("no icon titled '%s'" % ref)
+
+
+def position(listIcons, ref, extra = 0):
+    """The 0-based index of a 1-based position, 'top' or 'bottom'. With
+    extra = 1 the position one past the last icon is valid too."""
+
+    last = len(listIcons) - 1 + extra
+    if ref == 'top':
+        return 0
+    if ref == 'bottom':
+        return max(last, 0)
+    if ref.isdigit() and 1 <= int(ref) <= last + 1:
+        return int(ref) - 1
+
+    raise CliError("invalid position '%s'" % ref)
+
+
+def parseOptions(args):
+    """Turn 'set' arguments into (option, value) pairs: '--opt value',
+    '--flag', and '--no-opt' (value False) to remove an option."""
+
+    pairs = []
+    pos = 0
+    while pos < len(args):
+        option = args[pos]
+        if not option.startswith('--') or option == '--':
+            raise CliError("expected an option, got '%s'" % option)
+
+        if option.startswith('--no-'):
+            pairs.append(('--' + option[5:], False))
+        elif pos + 1 < len(args) and not args[pos+1].startswith('--'):
+            pairs.append((option, args[pos+1]))
+            pos += 1
+        else:
+            pairs.append((option, None))
+
+        pos += 1
+
+    return pairs
+
+
+def checkPairs(pairs):
+    """Raise CliError for the first pair the dialog would not accept, so
+    that nothing is written."""
+
+    for option, value in pairs:
+        if value is False:
+            problem = None if option in OPTIONS else 'unknown option'
+        else:
+            problem = checkOption(option, value)
+
+        if problem is not None:
+            raise CliError('%s: %s' % (option, problem))
+
+
+def getOptions(args):
+    """The option names among the 'get' arguments, in the order given."""
+
+    options = []
+    pos = 0
+    while pos < len(args):
+        arg = args[pos]
+        if arg in ('-c', '--config', '-b', '--backups'):
+            pos += 2
+            continue
+
+        if not arg.startswith('-') or (arg.startswith('--') and
+                '=' not in arg):
+            options.append(arg)
+        pos += 1
+
+    return options
+
+
+def exportData(barSettings, listIcons):
+
+    command = WbarCommand(barSettings.command)
+
+    return {
+        'image': barSettings.image,
+        'command': barSettings.command,
+        'options': dict(command.items()),
+        'font': barSettings.font,
+        'fontSize': barSettings.fontSize,
+        'icons': [{'icon': e.icon, 'command': e.command, 'title': e.title}
+            for e in listIcons],
+    }
+
+
+def runGet(args, confFl, out):
+
+    barSettings = loadConfig(confFl)[1]
+    command = WbarCommand(barSettings.command)
+
+    if not args.options:
+        out.write(barSettings.command + '\n')
+        return 0
+
+    status = 0
+    for option in args.options:
+        option = option if option.startswith('--') else '--' + option
+        if option not in command:
+            status = 1
+            continue
+
+        value = command.get(option)
+        out.write('%s\n' % (option if value is None else value))
+
+    return status
+
+
+def runSet(args, confFl, out):
+
+    document, barSettings, listIcons = loadConfig(confFl)
+    command = WbarCommand(barSettings.command)
+
+    pairs = parseOptions(args.options)
+    checkPairs(pairs)
+
+    for option, value in pairs:
+        if value is False:
+            command.unset(option)
+        else:
+            command.set(option, value)
+
+    barSettings.command = str(command)
+    return document.save(confFl, barSettings, listIcons, args.backups)
+
+
+def runAddIcon(args, confFl, out):
+
+    document, barSettings, listIcons = loadConfig(confFl)
+
+    row = position(listIcons, args.at, 1) if args.at else len(listIcons)
+    listIcons.insert(row, IconEntry(args.icon, args.command, args.title))
+
+    return document.save(confFl, barSettings, listIcons, args.backups)
+
+
+def runMove(args, confFl, out):
+
+    document, barSettings, listIcons = loadConfig(confFl)
+
+    row = findIcon(listIcons, args.icon)
+    dest = position(listIcons, args.to)
+    listIcons.insert(dest, listIcons.pop(row))
+
+    return document.save(confFl, barSettings, listIcons, args.backups)
+
+
+def runRemove(args, confFl, out):
+
+    document, barSettings, listIcons = loadConfig(confFl)
+
+    rows = set(findIcon(listIcons, ref) for ref in args.icons)
+    listIcons[:] = [e for row, e in enumerate(listIcons) if row not in rows]
+
+    return document.save(confFl, barSettings, listIcons, args.backups)
+
+
+def runExport(args, confFl, out):
+
+    document, barSettings, listIcons = loadConfig(confFl)
+
+    if args.format == 'wbar':
+        blocks = document.diff(barSettings, listIcons)[0]
+        out.write(document.text(blocks))
+    else:
+        out.write(json.dumps(exportData(barSettings, listIcons),
+            sort_keys = True) + '\n')
+
+    return 0
+
+
+def runValidate(args, files, out):
+
+    # Imported here, the process pool is not needed by the other commands
+    from wbarvalidate import Validator
+
+    report = Validator(args.jobs).validate(files)
+
+    if args.format == 'json':
+        out.write(json.dumps(report, indent = 1) + '\n')
+    else:
+        for fileReport in report['files']:
+            for p in fileReport['problems']:
+                out.write('%s: block %d: %s: %s: %s: %s\n' % (
+                    fileReport['file'], p['block'], p['severity'], p['kind'],
+                    p['value'], p['message']))
+
+    return 0 if report['ok'] else 1
+
+
+def makeParser(prog):
+
+    parser = argparse.ArgumentParser(prog = prog, allow_abbrev = False,
+        description = 'Edit wbar configs without starting the GUI.')
+    sub = parser.add_subparsers(dest = 'action', metavar = 'command')
+    sub.required = True
+
+    def add(name, func, helpStr):
+
+        p = sub.add_parser(name, help = helpStr, description = helpStr,
+            allow_abbrev = False)
+        p.add_argument('-c', '--config', action = 'append',
+            metavar = 'wbarconfig',
+            help = 'config file to work on, may be repeated '
+            '(default: ~/.wbar)')
+        p.add_argument('-b', '--backups', type = int, default = 0,
+            metavar = 'n', help = 'keep n backups of each changed file')
+        p.set_defaults(func = func)
+        return p
+
+    p = add('get', runGet, 'Print the wbar command, or the given options.')
+    p.add_argument('options', nargs = '*', metavar = 'option',
+        help = "option name, like 'zoomf' or '--zoomf'")
+
+    # The options of 'set' are the ones parse_known_args leaves over
+    add('set', runSet, "Set wbar options, e.g. 'set --zoomf 2.0 --vbar'. "
+        "'--no-<option>' removes an option.")
+
+    p = add('add-icon', runAddIcon, 'Add a launcher.')
+    p.add_argument('icon', help = 'icon image path')
+    p.add_argument('command', help = 'command to run')
+    p.add_argument('title', help = 'title shown under the icon')
+    p.add_argument('--at', metavar = 'pos',
+        help = "1-based position, 'top' or 'bottom' (default: bottom)")
+
+    p = add('move', runMove, 'Move a launcher.')
+    p.add_argument('icon', help = '1-based position or title of the icon')
+    p.add_argument('to', help = "1-based position, 'top' or 'bottom'")
+
+    p = add('remove', runRemove, 'Remove launchers.')
+    p.add_argument('icons', nargs = '+', metavar = 'icon',
+        help = '1-based position or title of the icon')
+
+    p = add('export', runExport, 'Print the config as JSON or wbar text.')
+    p.add_argument('--format', choices = ('json', 'wbar'), default = 'json')
+
+    p = add('validate', runValidate, 'Check icons, commands, the font and '
+        'the option values of many configs in parallel.')
+    p.add_argument('files', nargs = '*', metavar = 'wbarconfig')
+    p.add_argument('-j', '--jobs', type = int, metavar = 'n',
+        help = 'number of worker processes (default: one per CPU)')
+    p.add_argument('--format', choices = ('json', 'text'), default = 'json')
+
+    return parser
+
+
+def main(argv, out = sys.stdout):
+    """Run one subcommand over every config given. Return the exit
+    status."""
+
+    parser = makeParser(os.path.basename(argv[0]))
+    args, rest = parser.parse_known_args(argv[1:])
+
+    # Options spelled '--zoomf' are left over too
+    if args.action == 'set':
+        args.options = rest
+    elif args.action == 'get' and all(arg.startswith('--') for arg in rest):
+        args.options = getOptions(argv[2:])
+    elif rest:
+        parser.error('unrecognized arguments: %s' % ' '.join(rest))
+
+    if args.action == 'validate':
+        return runValidate(args, (args.config or []) + args.files or
+            [defaultConfig()], out)
+
+    status = 0
+    for confFl in args.config or [defaultConfig()]:
+        try:
+            result = args.func(args, confFl, out)
+        except (CliError, OSError) as err:
+            sys.stderr.write('%s: %s: %s\n' % (parser.prog, confFl, err))
+            status = 2
+            continue
+
+        if args.action in ('get', 'export'):
+            status = max(status, result)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,789 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import os
+import json
+import shlex
+import shutil
+import tempfile
+from collections import namedtuple
+
+# Characters that need the (slow) shell lexer, everything else splits on
+# whitespace alone.
+_SHELL_CHARS = frozenset('\'"\\')
+
+# Font file extensions, in order of preference when several files share a
+# name
+FONT_EXTS = ('.ttf', '.otf', '.ttc', '.pcf', '.pcf.gz', '.woff', '.woff2')
+
+class OptionEnum(object):
+    """The values an enumerated option takes, with the label the dialog
+    shows for each. Value, label and position map to each other through
+    dictionaries built once, so every lookup is constant time."""
+
+    __slots__ = ('values', 'labels', '_byValue', '_byLabel')
+
+    def __init__(self, values, labels = None):
+
+        self.values = tuple(values)
+        self.labels = tuple(labels) if labels else self.values
+
+        self._byValue = dict((v, i) for i, v in enumerate(self.values))
+        self._byLabel = dict((l, i) for i, l in enumerate(self.labels))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __contains__(self, value):
+        return value in self._byValue
+
+    def index(self, value):
+        return self._byValue[value]
+
+    def label(self, value):
+        return self.labels[self._byValue[value]]
+
+    def value(self, label):
+        return self.values[self._byLabel[label]]
+
+
+SCREEN_POSITIONS = OptionEnum(('top', 'bottom', 'left', 'right', 'center',
+    'bot-right', 'bot-left', 'top-right', 'top-left'))
+
+ICON_SIZES = OptionEnum(('16', '24', '32', '48', '64', '72', '96', '128'))
+
+FILTER_MODES = OptionEnum(('0', '1', '2', '3'),
+    ('none', 'hovered', 'others', 'all'))
+
+# One row per wbar option, in the order getCommand writes them. The dialog
+# builds its widgets from the table and the command line is read and
+# written through it, so a new option only needs a new row.
+#   tab      'Preferences' or 'Effects'
+#   kind     'flag' (a check box alone), 'choice' (combo box), 'int' (spin
+#            box), 'float' (double spin box) or 'color' (color button)
+#   values   (min, max) for numbers, the OptionEnum of a choice
+#   default  value shown before a config is read, checked the check box state
+OptionSpec = namedtuple('OptionSpec', ('flag', 'tab', 'label', 'kind',
+    'values', 'default', 'checked'))
+
+OPTION_SCHEMA = (
+    OptionSpec('--bpress', 'Preferences', 'Icon gets pressed', 'flag', None,
+        None, True),
+    OptionSpec('--above-desk', 'Preferences', 'Run over the desktop', 'flag',
+        None, None, True),
+    OptionSpec('--vbar', 'Preferences', 'Vertical bar', 'flag', None, None,
+        True),
+    OptionSpec('--nofont', 'Preferences', 'Disable font rendering', 'flag',
+        None, None, True),
+    OptionSpec('--grow', 'Preferences', 'Inverting icons growth', 'flag', None,
+        None, False),
+    OptionSpec('--noreload', 'Preferences', 'No reload', 'flag', None, None,
+        False),
+    OptionSpec('--pos', 'Preferences', 'Screen position', 'choice',
+        SCREEN_POSITIONS, 'right', True),
+    OptionSpec('--offset', 'Preferences', 'Border offset', 'int', (0, 30), 0,
+        False),
+    OptionSpec('--isize', 'Effects', 'Icon Size', 'choice', ICON_SIZES, '32',
+        True),
+    OptionSpec('--idist', 'Effects', 'Icon Distance', 'int', (1, 10), 5, True),
+    OptionSpec('--nanim', 'Effects', 'Number of animated icons', 'int', (1, 5),
+        3, True),
+    OptionSpec('--zoomf', 'Effects', 'Zoom factor', 'float', (0, 2.5), 1.8,
+        True),
+    OptionSpec('--jumpf', 'Effects', 'Jump factor', 'float', (0, 1.5), 0.9,
+        True),
+    OptionSpec('--dblclk', 'Effects', 'Time for double click (ms)', 'int',
+        (0, 300), 250, True),
+    OptionSpec('--balfa', 'Effects', 'Bar alpha level', 'int', (0, 100), 23,
+        True),
+    OptionSpec('--falfa', 'Effects', 'Bar unfocussed alpha level', 'int',
+        (0, 100), 84, True),
+    OptionSpec('--filter', 'Effects', 'Color filter mode', 'choice',
+        FILTER_MODES, '0', True),
+    OptionSpec('--fc', 'Effects', 'Color filter', 'color', None, '0xff00c800',
+        True),
+)
+
+OPTIONS = dict((spec.flag, spec) for spec in OPTION_SCHEMA)
+
+# The wbar options in the order getCommand writes them
+COMMAND_OPTIONS = tuple(spec.flag for spec in OPTION_SCHEMA)
+
+
+def commandLine(program, values):
+    """Return the wbar command line for the flag -> value mapping of the
+    options that are set, None as value for a plain flag."""
+
+    return ' '.join([program] + [flag if values[flag] is None else
+        '%s %s' % (flag, values[flag]) for flag in COMMAND_OPTIONS
+        if flag in values])
+
+
+def optionValues(command):
+    """Return the flag -> value mapping of the schema options set in the
+    WbarCommand, None as value for a plain flag."""
+
+    return dict((flag, command.get(flag)) for flag in COMMAND_OPTIONS
+        if flag in command)
+
+
+class WbarCommand(object):
+    """Tokenized model of the wbar command line (the 'c:' line of the
+    dock block)."""
+
+    def __init__(self, cmd = ''):
+
+        self.cmd = cmd
+
+        self.tokens = self.tokenize(cmd)
+        self.program = self.tokens[0] if self.tokens else ''
+
+        # Every token mapped to the token following it, built in one pass.
+        # An option's value is its successor unless that is an option too.
+        self._next = dict(zip(self.tokens[1:], self.tokens[2:] + ['']))
+
+    @staticmethod
+    def tokenize(cmd):
+
+        if _SHELL_CHARS.isdisjoint(cmd):
+            return cmd.split()
+
+        try:
+            return shlex.split(cmd)
+        except ValueError:
+            # Unbalanced quotes, fall back to plain whitespace splitting
+            return cmd.split()
+
+    def __contains__(self, option):
+        return option.startswith('--') and option in self._next
+
+    def get(self, option, default = None):
+
+        value = self._next.get(option, '')
+        return default if not value or value.startswith('--') else value
+
+    def items(self):
+
+        # Options in command line order, with None for plain flags
+        return [(token, self.get(token)) for token in self.tokens[1:]
+            if token.startswith('--')]
+
+    def __str__(self):
+
+        # Quote only the tokens the shell would split or unquote
+        return ' '.join(shlex.quote(token) if not token or
+            not _SHELL_CHARS.isdisjoint(token) or len(token.split()) != 1
+            else token for token in self.tokens)
+
+    def _reindex(self):
+
+        self.program = self.tokens[0] if self.tokens else ''
+        self._next = dict(zip(self.tokens[1:], self.tokens[2:] + ['']))
+        self.cmd = str(self)
+
+    def _hasValue(self, pos):
+
+        return (pos + 1 < len(self.tokens) and
+            not self.tokens[pos+1].startswith('--'))
+
+    def set(self, option, value = None):
+        """Set an option, a plain flag if value is None. An option already
+        on the line is changed in place, a new one goes where getCommand
+        would write it."""
+
+        if not self.tokens:
+            self.tokens = ['wbar']
+
+        new = [option] if value is None else [option, str(value)]
+
+        if option in self:
+            pos = len(self.tokens) - 1 - self.tokens[::-1].index(option)
+            end = pos + 2 if self._hasValue(pos) else pos + 1
+        else:
+            # Before the first option getCommand writes after this one
+            later = COMMAND_OPTIONS[COMMAND_OPTIONS.index(option) + 1:] \
+                if option in COMMAND_OPTIONS else ()
+            pos = next((i for i, token in enumerate(self.tokens)
+                if i > 0 and token in later), len(self.tokens))
+            end = pos
+
+        self.tokens[pos:end] = new
+        self._reindex()
+
+    def unset(self, option):
+
+        pos = 1
+        while pos < len(self.tokens):
+            if self.tokens[pos] == option:
+                end = pos + 2 if self._hasValue(pos) else pos + 1
+                del self.tokens[pos:end]
+            else:
+                pos += 1
+
+        self._reindex()
+
+
+def checkOption(option, value):
+    """Return why value is not one the dialog accepts for option, or None
+    if it is fine. value is None for a plain flag."""
+
+    spec = OPTIONS.get(option)
+    if spec is None:
+        return 'unknown option'
+
+    if spec.kind == 'flag':
+        return None if value is None else 'takes no value'
+
+    if value is None:
+        return 'needs a value'
+
+    if spec.kind == 'color':
+        # Colors are 0xAARRGGBB
+        try:
+            valid = value[:2].lower() == '0x' and len(value) == 10 and \
+                int(value, 16) >= 0
+        except ValueError:
+            valid = False
+        return None if valid else "'%s' is not a 0xAARRGGBB color" % value
+
+    if spec.kind == 'choice':
+        return None if value in spec.values else "'%s' is not one of %s" % (
+            value, ', '.join(spec.values))
+
+    try:
+        number = int(value) if spec.kind == 'int' else float(value)
+    except ValueError:
+        return "'%s' is not a number" % value
+
+    low, high = spec.values
+    if not low <= number <= high:
+        return '%s is out of range [%s, %s]' % (value, low, high)
+
+    return None
+
+
+class IconEntry(object):
+    """One launcher block of the config file."""
+
+    __slots__ = ('icon', 'command', 'title')
+
+    def __init__(self, icon = '', command = '', title = ''):
+        self.icon = icon
+        self.command = command
+        self.title = title
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and
+            all(getattr(self, k) == getattr(other, k) for k in self.__slots__))
+
+    def __repr__(self):
+        return '%s(%r, %r, %r)' % (type(self).__name__, self.icon,
+            self.command, self.title)
+
+    def values(self):
+        # The 'i:', 'c:' and 't:' values
+        return (self.icon, self.command, self.title)
+
+
+class BarSettings(object):
+    """The first block of the config file: the dock background image, the
+    wbar command line and the font used for the titles."""
+
+    __slots__ = ('image', 'command', 'font', 'fontSize')
+
+    def __init__(self, image = '', command = 'wbar', font = '',
+                 fontSize = None):
+        self.image = image
+        self.command = command
+        # Font path without its extension, as wbar expects it
+        self.font = font
+        self.fontSize = fontSize
+
+    @classmethod
+    def fromBlock(cls, block):
+
+        # The 't:' line is '<font path without extension>/<size>', or the
+        # font path alone
+        font, sep, size = block.title.rpartition('/')
+        if sep and size.isdigit():
+            return cls(block.icon, block.command, font, int(size))
+
+        return cls(block.icon, block.command, block.title, None)
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and
+            all(getattr(self, k) == getattr(other, k) for k in self.__slots__))
+
+    def __repr__(self):
+        return '%s(%r, %r, %r, %r)' % (type(self).__name__, self.image,
+            self.command, self.font, self.fontSize)
+
+    def fontLine(self):
+
+        if self.fontSize is None:
+            return self.font
+
+        return '%s/%s' % (self.font, self.fontSize)
+
+    def values(self):
+        # The 'i:', 'c:' and 't:' values
+        return (self.image, self.command, self.fontLine())
+
+
+def stripFontExt(path, exts = FONT_EXTS):
+    """Return the font path without its extension, as the 't:' line wants
+    it ('.pcf.gz' counts as one extension)."""
+
+    lower = path.lower()
+    for ext in sorted(exts, key = len, reverse = True):
+        if lower.endswith(ext):
+            return path[:-len(ext)]
+
+    return os.path.splitext(path)[0]
+
+
+class FontResolver(object):
+    """Finds the font file behind the extensionless path of the 't:' line.
+    Each directory is listed once into a name -> files index, so resolving
+    costs no stat calls after that."""
+
+    def __init__(self, exts = FONT_EXTS):
+
+        self.exts = tuple(exts)
+        self._dirs = {}
+
+    def _index(self, direc):
+
+        index = self._dirs.get(direc)
+        if index is not None:
+            return index
+
+        # Longest extension first so that 'x.pcf.gz' is not taken as 'x.pcf'
+        byLength = sorted(self.exts, key = len, reverse = True)
+        rank = dict((ext, i) for i, ext in enumerate(self.exts))
+        index = {}
+
+        try:
+            entries = os.listdir(direc or '.')
+        except OSError:
+            entries = []
+
+        for name in entries:
+            lower = name.lower()
+            for ext in byLength:
+                if lower.endswith(ext):
+                    index.setdefault(name[:-len(ext)], []).append(
+                        (rank[ext], os.path.join(direc, name)))
+                    break
+
+        for stem in index:
+            index[stem] = [path for _, path in sorted(index[stem])]
+
+        self._dirs[direc] = index
+        return index
+
+    def candidates(self, pathNoExt):
+        """Return every font file matching the path, preferred first."""
+
+        direc, stem = os.path.split(pathNoExt)
+        return list(self._index(direc).get(stem, []))
+
+    def resolve(self, pathNoExt):
+
+        files = self.candidates(pathNoExt)
+        return files[0] if files else None
+
+
+def iterBlocks(fh):
+    """Yield every 'i:/c:/t:' block of an open config file as an IconEntry,
+    reading one line at a time."""
+
+    block = None
+
+    for line in fh:
+        line = line.strip()
+        key = line[:3]
+
+        if key == 'i: ':
+            if block is not None:
+                # A new 'i:' line starts a new block even without a blank
+                # line in between
+                yield block
+            block = IconEntry(line[3:])
+
+        elif key == 'c: ' or key == 't: ':
+            if block is None:
+                block = IconEntry()
+
+            if key == 'c: ':
+                block.command = line[3:]
+            else:
+                block.title = line[3:]
+
+        elif line.startswith('#'):
+            # Avoid comment lines
+            continue
+
+        elif block is not None:
+            yield block
+            block = None
+
+    if block is not None:
+        yield block
+
+
+def iterConfig(confFl):
+    """Yield the BarSettings of the config file followed by each of its
+    IconEntry blocks, without loading the whole file."""
+
+    with open(confFl, 'r') as fh:
+
+        blocks = iterBlocks(fh)
+
+        for block in blocks:
+            yield BarSettings.fromBlock(block)
+            break
+
+        yield from blocks
+
+
+def readConfig(confFl):
+    """Return the (BarSettings, list of IconEntry) pair of a config file.
+    The settings are None if the file has no blocks."""
+
+    entries = iterConfig(confFl)
+    barSettings = next(entries, None)
+
+    return barSettings, list(entries)
+
+
+# Line prefixes of a block, in the order of IconEntry.values()
+_PREFIXES = ('i: ', 'c: ', 't: ')
+
+
+class _Block(object):
+
+    # 'lead' are the comment, blank and unknown lines before the block,
+    # 'raw' the block lines as read and 'saved' the values they hold.
+    __slots__ = ('lead', 'raw', 'entry', 'saved')
+
+    def __init__(self, lead, raw, entry):
+        self.lead = lead
+        self.raw = raw
+        self.entry = entry
+        self.saved = entry.values()
+
+
+class ConfigDocument(object):
+    """A config file kept line by line, so that saving it again leaves the
+    comments, blank lines and unknown lines where they were, and rewrites
+    only the lines of the blocks whose values changed."""
+
+    def __init__(self, blocks = None, trailing = None):
+
+        # The first block holds the BarSettings, the others IconEntry
+        self.blocks = blocks or []
+        self.trailing = trailing or []
+
+    @classmethod
+    def read(cls, confFl):
+
+        with open(confFl, 'r') as fh:
+            return cls.parse(fh.read().splitlines())
+
+    @classmethod
+    def parse(cls, lines):
+
+        blocks = []
+        pending = []
+        block = None
+
+        for raw in lines:
+            line = raw.strip()
+            key = line[:3]
+
+            if key in _PREFIXES:
+                if key == 'i: ' and block is not None:
+                    blocks.append(block)
+                    block = None
+
+                if block is None:
+                    block = ([], pending, IconEntry())
+                    pending = []
+
+                block[0].append(raw)
+                setattr(block[2], IconEntry.__slots__[_PREFIXES.index(key)],
+                    line[3:])
+
+            elif line.startswith('#') and block is not None:
+                # Comments inside a block stay with it
+                block[0].append(raw)
+
+            elif (line and not line.startswith('#') and block is None and
+                    blocks and not pending):
+                # Unknown lines right after a block belong to it
+                blocks[-1][0].append(raw)
+
+            else:
+                if block is not None:
+                    blocks.append(block)
+                    block = None
+
+                    if line and not line.startswith('#'):
+                        blocks[-1][0].append(raw)
+                        continue
+
+                pending.append(raw)
+
+        if block is not None:
+            blocks.append(block)
+
+        doc = cls(trailing = pending)
+        for i, (raw, lead, entry) in enumerate(blocks):
+            if i == 0:
+                entry = BarSettings.fromBlock(entry)
+            doc.blocks.append(_Block(lead, raw, entry))
+
+        return doc
+
+    def barSettings(self):
+        return self.blocks[0].entry if self.blocks else None
+
+    def icons(self):
+        return [block.entry for block in self.blocks[1:]]
+
+    @staticmethod
+    def _rewrite(raw, values):
+
+        # Replace the value of each key line, keep every other line
+        lines = []
+        seen = set()
+
+        for line in raw:
+            key = line.strip()[:3]
+            if key in _PREFIXES and key not in seen:
+                seen.add(key)
+                indent = line[:len(line) - len(line.lstrip())]
+                line = indent + key + values[_PREFIXES.index(key)]
+            lines.append(line)
+
+        for key, value in zip(_PREFIXES, values):
+            if key not in seen:
+                lines.append(key + value)
+
+        return lines
+
+    def diff(self, barSettings, listIcons):
+        """Return the new list of blocks for the given settings and icons,
+        and the number of blocks added, changed, moved or removed."""
+
+        known = dict((id(block.entry), block) for block in self.blocks[1:])
+        entries = [barSettings] + list(listIcons)
+        blocks = []
+        changed = 0
+
+        for i, entry in enumerate(entries):
+
+            if i == 0:
+                old = self.blocks[0] if self.blocks else None
+            else:
+                old = known.get(id(entry))
+            values = entry.values()
+
+            if old is None:
+                # New block, separated from the previous one by a blank line
+                lead = [''] if i > 0 else []
+                block = _Block(lead, self._rewrite([], values), entry)
+                changed += 1
+
+            elif values != old.saved:
+                block = _Block(old.lead, self._rewrite(old.raw, values), entry)
+                changed += 1
+
+            else:
+                block = _Block(old.lead, old.raw, entry)
+
+            blocks.append(block)
+
+        # Blocks of deleted icons, and kept icons that changed place
+        kept = [id(entry) for entry in listIcons if id(entry) in known]
+        keptSet = set(kept)
+        oldOrder = [key for key in known if key in keptSet]
+
+        changed += len(known) - len(keptSet)
+        changed += sum(1 for a, b in zip(oldOrder, kept) if a != b)
+
+        return blocks, changed
+
+    def lines(self, blocks = None):
+
+        if blocks is None:
+            blocks = self.blocks
+
+        lines = []
+        for block in blocks:
+            lines.extend(block.lead)
+            lines.extend(block.raw)
+
+        trailing = self.trailing if self.blocks else ['']
+        lines.extend(trailing)
+
+        return lines
+
+    def text(self, blocks = None):
+        return '\n'.join(self.lines(blocks)) + '\n'
+
+    def save(self, confFl, barSettings, listIcons, backups = 0):
+        """Write the settings and icons to confFl if they differ from what
+        is there, keeping up to 'backups' previous versions. Return the
+        number of changed blocks, 0 when nothing was written."""
+
+        blocks, changed = self.diff(barSettings, listIcons)
+        text = self.text(blocks)
+
+        try:
+            with open(confFl, 'r') as fh:
+                current = fh.read()
+        except OSError:
+            current = None
+
+        if text == current:
+            self.blocks = blocks
+            return 0
+
+        atomicWrite(confFl, text, backups)
+
+        self.trailing = self.trailing if self.blocks else ['']
+        self.blocks = blocks
+
+        return max(changed, 1)
+
+
+def rotateBackups(path, backups):
+
+    # path.1 is the newest backup, path.<backups> the oldest
+    for i in range(backups - 1, 0, -1):
+        older = '%s.%d' % (path, i)
+        if os.path.exists(older):
+            os.replace(older, '%s.%d' % (path, i + 1))
+
+    newest = path + '.1'
+    if os.path.exists(newest):
+        os.unlink(newest)
+
+    # A hard link costs no copy and the config itself is never missing
+    try:
+        os.link(path, newest)
+    except OSError:
+        shutil.copy2(path, newest)
+
+
+def atomicWrite(path, text, backups = 0):
+    """Replace the file at path with text so that readers see either the
+    old or the new content, even if we crash half way: the text goes to a
+    temporary file in the same directory which is synced and renamed over
+    the original."""
+
+    # Write through a symlinked config instead of replacing the link
+    path = os.path.realpath(path)
+    direc = os.path.dirname(path)
+
+    fd, tmpPath = tempfile.mkstemp(prefix = '.' + os.path.basename(path)
+        + '.', dir = direc)
+
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        if os.path.exists(path):
+            shutil.copymode(path, tmpPath)
+
+            if backups > 0:
+                rotateBackups(path, backups)
+        else:
+            # mkstemp creates the file as 0600, use the usual mode instead
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmpPath, 0o666 & ~umask)
+
+        os.replace(tmpPath, path)
+
+    except BaseException:
+        if os.path.exists(tmpPath):
+            os.unlink(tmpPath)
+        raise
+
+    # Make the rename itself durable
+    try:
+        dirFd = os.open(direc, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(dirFd)
+    except OSError:
+        pass
+    finally:
+        os.close(dirFd)
+
+
+def cacheHome():
+    """The XDG cache directory."""
+
+    return os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+
+
+def cachePath(name):
+    """The path of a file wbar-settings keeps in the cache directory."""
+
+    return os.path.join(cacheHome(), 'wbar-settings', name)
+
+
+def loadIndex(path, version):
+    """The directories of an index saved by saveIndex, {} if the file is
+    missing, damaged or of another version."""
+
+    try:
+        with open(path, 'r') as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+
+    return data.get('dirs', {})
+
+
+def saveIndex(path, version, dirs):
+    """Save the directories of an index as JSON, return False if the file
+    cannot be written. The index is a cache, callers try again later."""
+
+    data = {'version': version, 'dirs': dirs}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        atomicWrite(path, json.dumps(data))
+    except OSError:
+        return False
+
+    return True
+
+
+def dataDirs():
+    """The XDG data directories, the user's one first."""
+
+    dataHome = os.environ.get('XDG_DATA_HOME') or os.path.join(
+        os.path.expanduser('~'), '.local', 'share')
+    dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+
+    return [dataHome] + [direc for direc in dirs.split(':') if direc]
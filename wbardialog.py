@@ -0,0 +1,1346 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import re
+import os
+from functools import partial
+
+from PyQt5.QtWidgets import (QDialog, QWidget, QVBoxLayout, 
+    QHBoxLayout, QPushButton, QTabWidget, QTableView, 
+    QFormLayout, QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox,
+    QFrame, QColorDialog, QLabel, QLineEdit, QFileDialog, QMessageBox, 
+    QStatusBar, QDialogButtonBox, QUndoStack, QAction, QApplication,
+    QListWidget, QListWidgetItem, QScrollArea, QCompleter, QStyle)
+from PyQt5.QtCore import (Qt, QSettings, QTimer, QItemSelection,
+    QItemSelectionModel)
+from PyQt5.QtGui import (QIcon, QColor, QKeySequence)
+from filedialogpreview import FontDialogPreview, ImageDialogPreview
+from iconmodel import (IconTableModel, IconFilterProxy, IconDelegate,
+    InsertIconCommand,
+    RemoveIconCommand, ReplaceIconCommand, MoveIconCommand,
+    RemoveIconsCommand, MoveIconsCommand, AddIconsCommand)
+from thumbnailcache import sharedCache
+from wbarreload import WbarReloader
+from wbartrace import tracer, span
+from fontcatalog import FontCatalog
+from dockpreview import DockPreview
+from desktopentries import ApplicationIndex
+from icontheme import IconThemeIndex
+from wbarconfig import (WbarCommand, BarSettings, IconEntry, ConfigDocument,
+    FONT_EXTS, OPTION_SCHEMA, OPTIONS, optionValues, stripFontExt)
+
+class SelectIcon(QDialog):
+    """Main Window."""
+
+    def __init__(self, window_icon_path, inputIcon = None, themeIndex = None,
+                 iconSize = 32, *args, **kwargs):
+
+        """Initializer."""
+        super(SelectIcon, self).__init__(*args, **kwargs)
+
+        self.window_title = 'Select Icon'
+        self.setWindowTitle(self.window_title)
+        
+        self.window_icon_path = window_icon_path
+        self.setWindowIcon(QIcon(self.window_icon_path))
+
+        self.inputIcon = inputIcon
+        self.iconsDirecDefault = '/usr/share/icons'
+
+        # Icon names typed in the icon field are looked up in the themes
+        self.themeIndex = themeIndex
+        self.iconSize = iconSize
+
+        self.minWidth = 300
+        self.minHeight = 135
+
+        self.setMinimumWidth(self.minWidth)
+        self.setMinimumHeight(self.minHeight)
+
+        self.vbox = QVBoxLayout()
+        self.setLayout(self.vbox)
+
+        self._createForm()
+        self._createButtons()
+
+    def _createForm(self):
+
+        form = QFormLayout()
+        self.vbox.addLayout(form)
+
+        # Title
+        self.titleEdit = QLineEdit()
+        if self.inputIcon:
+            self.titleEdit.setText(self.inputIcon.title)
+            self.titleEdit.setCursorPosition(0)
+        form.addRow('Title:', self.titleEdit)
+        # Title
+
+        # Icon
+        iconHBox = QHBoxLayout()
+
+        self.iconEdit = QLineEdit()
+        if self.inputIcon:
+            self.iconEdit.setText(self.inputIcon.icon)
+            self.iconEdit.setCursorPosition(0)
+        self.iconEdit.setToolTip('Image file, or the name of an icon of the '
+            + 'icon theme')
+        self.iconEdit.editingFinished.connect(self.resolveIconName)
+        iconHBox.addWidget(self.iconEdit)
+
+        # The names of the theme icons are offered while typing
+        if self.themeIndex is not None:
+            completer = QCompleter(self.themeIndex.names(), self.iconEdit)
+            completer.setCaseSensitivity(Qt.CaseInsensitive)
+            completer.setFilterMode(Qt.MatchContains)
+            self.iconEdit.setCompleter(completer)
+
+        iconBtn = QPushButton('...')
+        iconBtn.setToolTip('Select icon')
+        iconBtn.setFixedSize(24,24)
+        iconBtn.clicked.connect(self.iconBtnClicked)
+        iconHBox.addWidget(iconBtn)
+
+        form.addRow('Icon:', iconHBox)
+        # Icon
+
+        # Command
+        commandHBox = QHBoxLayout()
+
+        self.commandEdit = QLineEdit()
+        if self.inputIcon:
+            self.commandEdit.setText(self.inputIcon.command)
+            self.commandEdit.setCursorPosition(0)
+        commandHBox.addWidget(self.commandEdit)
+
+        commandBtn = QPushButton('...')
+        commandBtn.setToolTip('Select command')
+        commandBtn.setFixedSize(24,24)
+        commandBtn.clicked.connect(self.commandBtnClicked)
+        commandHBox.addWidget(commandBtn)
+
+        form.addRow('Command:', commandHBox)        
+        # Command
+
+    def resolveIconName(self):
+
+        # 'firefox' becomes the theme image closest to the dock icon size
+        name = self.iconEdit.text().strip()
+        if not name or os.sep in name or self.themeIndex is None:
+            return
+
+        path = self.themeIndex.resolve(name, self.iconSize,
+            QIcon.themeName())
+        if path:
+            self.iconEdit.setText(path)
+            self.iconEdit.setCursorPosition(0)
+
+    def iconBtnClicked(self):
+
+        currentImage = self.iconEdit.text()
+        
+        imageSelectDialog = ImageDialogPreview(currentImage)
+        imageSelectDialog.setWindowTitle('Select Image')
+        imageSelectDialog.setDirectory(self.iconsDirecDefault)
+        imageSelectDialog.setNameFilters(["Image Files (*.png *.jpg *.jpeg)"])
+        
+        imageSelectDialog.setFileMode(QFileDialog.ExistingFile)
+
+        if currentImage and os.path.exists(currentImage):
+            imageSelectDialog.selectFile(currentImage)
+
+        if imageSelectDialog.exec_() == ImageDialogPreview.Accepted:
+            iconSelected = imageSelectDialog.getFileSelected()
+            self.iconEdit.setText(iconSelected)
+
+        return        
+
+    def commandBtnClicked(self):
+
+        commandSelectDialog = QFileDialog(self, "Select Command",
+            "","All Files (*.*)")
+        commandSelectDialog.setFileMode(QFileDialog.ExistingFile)
+
+        if commandSelectDialog.exec_() == QFileDialog.Accepted:
+            commandSelected = commandSelectDialog.selectedFiles()[0]
+            self.commandEdit.setText(commandSelected)
+
+        return
+
+    def _createButtons(self):
+        buttonBox = QDialogButtonBox(self)
+        buttonBox.setStandardButtons(QDialogButtonBox.Ok |
+                                     QDialogButtonBox.Cancel)
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.close)
+
+        self.vbox.addWidget(buttonBox)
+
+    def accept(self): 
+
+        self.resolveIconName()
+
+        title = self.titleEdit.text()
+        icon = self.iconEdit.text()
+        command = self.commandEdit.text()
+
+        if title and icon and command:    
+
+            self._iconEntry = IconEntry(icon, command, title)
+
+            super(SelectIcon,self).accept()
+
+        else:
+
+            error_dlg = QMessageBox(QMessageBox.Critical, "Error", 
+                "<b>Some fields are empty</b>", QMessageBox.Ok)
+            error_dlg.setWindowIcon(QIcon(self.window_icon_path))
+            error_dlg.setInformativeText("The values are not valid values.")
+            error_dlg.exec_()
+
+            return
+
+    def get_output(self):
+        return self._iconEntry
+
+
+class ApplicationsDialog(QDialog):
+    """Lists the installed applications, to add several of them at once."""
+
+    def __init__(self, window_icon_path, appIndex, themeIndex, iconSize = 32,
+                 *args, **kwargs):
+
+        super(ApplicationsDialog, self).__init__(*args, **kwargs)
+
+        self.setWindowTitle('Import from Applications')
+        self.setWindowIcon(QIcon(window_icon_path))
+        self.setMinimumWidth(360)
+        self.setMinimumHeight(400)
+
+        self.vbox = QVBoxLayout()
+        self.setLayout(self.vbox)
+
+        self.filterEdit = QLineEdit()
+        self.filterEdit.setPlaceholderText('Filter')
+        self.filterEdit.setClearButtonEnabled(True)
+        self.filterEdit.textChanged.connect(self.filterApps)
+        self.vbox.addWidget(self.filterEdit)
+
+        self.appList = QListWidget()
+        self.appList.setSelectionMode(QListWidget.ExtendedSelection)
+        self.appList.itemDoubleClicked.connect(self.accept)
+        self.vbox.addWidget(self.appList)
+
+        # Only the directories changed since the last time are read
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            apps = appIndex.entries()
+            appIndex.save()
+            themeIndex.refresh()
+            themeIndex.save()
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        # wbar loads image files only, an Icon= name that resolves to none
+        # leaves the icon empty, to be filled in the icon table
+        noIcon = self.style().standardIcon(QStyle.SP_MessageBoxWarning)
+
+        for app in apps:
+            icon = themeIndex.resolve(app['icon'], iconSize,
+                QIcon.themeName()) if app['icon'] else ''
+            item = QListWidgetItem(QIcon(icon) if icon else noIcon,
+                app['name'])
+            if icon:
+                item.setToolTip(app['command'])
+            elif app['icon']:
+                item.setToolTip('%s\nNo image found for the icon \'%s\', '
+                    'the icon is left empty.' % (app['command'],
+                    app['icon']))
+            else:
+                item.setToolTip('%s\nNo icon, the icon is left empty.'
+                    % app['command'])
+            item.setData(Qt.UserRole, IconEntry(icon, app['command'],
+                app['name']))
+            self.appList.addItem(item)
+
+        buttonBox = QDialogButtonBox(QDialogButtonBox.Ok |
+            QDialogButtonBox.Cancel, self)
+        buttonBox.accepted.connect(self.accept)
+        buttonBox.rejected.connect(self.reject)
+        self.vbox.addWidget(buttonBox)
+
+    def filterApps(self, text):
+
+        text = text.lower()
+        for row in range(self.appList.count()):
+            item = self.appList.item(row)
+            entry = item.data(Qt.UserRole)
+            item.setHidden(text not in entry.title.lower() and
+                text not in entry.command.lower())
+
+    def get_output(self):
+
+        # In the order of the list, the hidden rows may still be selected
+        items = [self.appList.item(row) for row in
+            range(self.appList.count())]
+
+        return [item.data(Qt.UserRole) for item in items
+            if item.isSelected() and not item.isHidden()]
+
+
+# https://www.geeksforgeeks.org/pyqt5-how-to-add-separator-in-status-bar/
+class HLine(QFrame):
+
+    # A simple Horizontal line
+    def __init__(self):
+  
+        super(HLine, self).__init__()
+        self.setFrameShape(self.HLine|self.Sunken)
+
+
+# https://www.geeksforgeeks.org/pyqt5-how-to-add-separator-in-status-bar/
+class VLine(QFrame):
+
+    # A simple Vertical line
+    def __init__(self):
+  
+        super(VLine, self).__init__()
+        self.setFrameShape(self.VLine|self.Sunken)
+
+
+class WbarDialog(QDialog):
+    """Main Window."""
+
+    def __init__(self, wbarFile = None, debug = False, backups = 0, 
+                 profile = False, *args, **kwargs):
+        """Initializer."""
+        super(WbarDialog, self).__init__(*args, **kwargs)
+
+        self.debug = debug
+
+        # Show the time of each traced phase in the status bar
+        self.profile = profile
+
+        # Number of rotated backups (.wbar.1, .wbar.2, ...) kept on save
+        self.backups = backups
+
+        wbarFileDefault = os.path.join(os.environ['HOME'], '.wbar') 
+
+        if wbarFile:
+            self.wbarFile = wbarFile
+        else:
+            self.wbarFile = wbarFileDefault
+
+        self.window_title = 'WBar Settings'
+        self.setWindowTitle(self.window_title)
+
+        script_dir = os.path.dirname(os.path.realpath(__file__))
+        self.icon_dir = os.path.join(script_dir, 'icons')
+        self.window_icon_path = os.path.join(self.icon_dir, 'wbar.png')
+        self.setWindowIcon(QIcon(self.window_icon_path))
+
+        # Window size
+        self.minWindowWidth = 400
+        self.minWindowHeight = 400
+        
+        # Default widget (like buttons) width
+        self.widgetWidth = 80
+        self.widgetHeight = 24
+
+        # StatusBar timout 
+        self.timeout = 5000
+
+        # Quiet period (ms) after the last edit before a live apply
+        self.applyDelay = 750
+
+        # Preferences
+        self.fontPathDefault = (
+        '/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf')
+        self.fontExts = list(FONT_EXTS)
+        self.fontSearchPath = '/usr/share/fonts'
+        self.fontCatalog = FontCatalog(self.fontExts)
+        self.fontSizeMin = 6
+        self.fontSizeMax = 96
+        self.fontSizeDefault = 12
+        self.imageDirecDefault = '/usr/share/pixmaps'
+        self.appIndex = None
+        self.themeIndex = None
+        self.barImageDefault = '/usr/share/pixmaps/wbar/dock.png'
+        # Preferences
+
+        # Effects
+        self.lightGray = '#32989898'
+
+        # flag -> (check box, value widget) of the options, and the color
+        # of the color buttons
+        self.optionWidgets = {}
+        self.optionColors = {}
+
+        # flag -> (checked, value) of the option widgets and the font path
+        # and size as the config left them, a save only rewrites what was
+        # edited since
+        self.loadedOptions = {}
+        self.loadedFont = None
+
+        # Built with the Effects tab
+        self.dockPreview = None
+        # Effects
+
+        self.setMinimumWidth(self.minWindowWidth)
+        self.setMinimumHeight(self.minWindowHeight)
+
+        self.barSettings = BarSettings()
+        self.wbarDocument = ConfigDocument()
+        self.wbarCommand = WbarCommand()
+        self.listIcons = []
+
+        self.vbox = QVBoxLayout()
+        self.setLayout(self.vbox)
+
+        self.settings = QSettings('wbar','window')
+
+        try:
+            self.resize(self.settings.value('windowSize'))
+            self.move(self.settings.value('windowPosition'))
+        except:
+            pass
+
+        # Create the widgets. The Preferences and Effects tabs are only
+        # built when first selected (or before saving).
+        self._createTabWidgets()
+        self._createIconsTab()
+        self._addLazyTab("Preferences", self._createPreferencesTab)
+        self._addLazyTab("Effects", self._createEffectsTab)
+        self._createButtons()
+        self._createStatusBar()
+
+        # Live apply
+        self.reloader = WbarReloader()
+        self.applyTimer = QTimer(self)
+        self.applyTimer.setSingleShot(True)
+        self.applyTimer.setInterval(self.applyDelay)
+        self.applyTimer.timeout.connect(self.saveConfig)
+        self._connectLiveApply(self.iconsWidget)
+
+        # The config is read once the window has been painted
+        self.configRead = False
+        self.configPending = True
+
+    def paintEvent(self, event):
+
+        super(WbarDialog, self).paintEvent(event)
+
+        if self.configPending:
+            self.configPending = False
+            QTimer.singleShot(0, self.loadConfig)
+
+    def loadConfig(self):
+
+        # Upload the config file, if it exists
+        if not os.path.exists(self.wbarFile):
+            return
+
+        barSettings, self.listIcons = self.readConfig(self.wbarFile)
+        self.updateTable()
+        self.selectRows(0, 0)
+
+        if barSettings:
+            self.barSettings = barSettings
+            self.wbarCommand = WbarCommand(barSettings.command)
+            self.configRead = True
+
+            # Tabs built before the config was read
+            for index in range(self.tabs.count()):
+                if index not in self.lazyTabs:
+                    self.updateTab(self.tabs.widget(index))
+
+    def _connectLiveApply(self, widget):
+
+        # Any edit restarts the timer, so a burst of edits (e.g. holding a
+        # spin box arrow) ends in a single save and reload.
+        for checkBox in widget.findChildren(QCheckBox):
+            checkBox.stateChanged.connect(self.scheduleApply)
+        for spinBox in widget.findChildren(QSpinBox):
+            spinBox.valueChanged.connect(self.scheduleApply)
+        for doubleSpinBox in widget.findChildren(QDoubleSpinBox):
+            doubleSpinBox.valueChanged.connect(self.scheduleApply)
+        for comboBox in widget.findChildren(QComboBox):
+            comboBox.currentTextChanged.connect(self.scheduleApply)
+        for lineEdit in widget.findChildren(QLineEdit):
+            if lineEdit is not self.filterEdit:
+                lineEdit.textChanged.connect(self.scheduleApply)
+
+        if widget is self.iconsWidget:
+            self.iconModel.dataChanged.connect(self.scheduleApply)
+            self.iconModel.rowsInserted.connect(self.scheduleApply)
+            self.iconModel.rowsRemoved.connect(self.scheduleApply)
+            self.iconModel.rowsMoved.connect(self.scheduleApply)
+            self.iconModel.layoutChanged.connect(self.scheduleApply)
+
+    def scheduleApply(self, *args):
+
+        if self.applyLiveCheckBox.isChecked():
+            self.applyTimer.start()
+
+    def updateWbarConfig(self):
+    
+        # Update background image
+        self.barImageEdit.setText(self.barSettings.image)
+        
+        # Update font path
+        fontFiles = self.fontCatalog.resolver.candidates(self.barSettings.font)
+        if fontFiles:
+            self.fontPathEdit.setText(fontFiles[0])
+        elif self.barSettings.font:
+            self.fontPathEdit.setText(self.barSettings.font)
+            self.statusBar.showMessage("Font '%s' not found, "
+                % self.barSettings.font
+                + "the 't:' line is kept as it is.")
+
+        if len(fontFiles) > 1:
+            self.statusBar.showMessage("Font '%s' matches %d files, " 
+                % (self.barSettings.font, len(fontFiles))
+                + "using '%s'." % os.path.basename(fontFiles[0]))
+        
+        # Update font size
+        if self.barSettings.fontSize is not None:
+            self.fontSizeSpinBox.setValue(self.barSettings.fontSize)
+
+        self.loadedFont = self.fontState()
+
+    def updatePreferences(self):
+        with span('updatePreferences'):
+            self.updateOptions('Preferences')
+
+    def updateEffects(self):
+        with span('updateEffects'):
+            self.updateOptions('Effects')
+
+    def updateOptions(self, tab):
+
+        # One dictionary lookup per option in the WbarCommand index
+        command = self.wbarCommand
+
+        for spec in OPTION_SCHEMA:
+            if spec.tab != tab:
+                continue
+
+            checkBox, widget = self.optionWidgets[spec.flag]
+            value = command.get(spec.flag)
+
+            if spec.flag in command and value is not None:
+                try:
+                    self.setOptionValue(spec, widget, value)
+                except (ValueError, KeyError):
+                    pass
+
+            checkBox.setChecked(spec.flag in command)
+            if widget is not None:
+                self.optionToggled(spec.flag)
+
+            self.loadedOptions[spec.flag] = self.optionState(spec)
+
+    def optionState(self, spec):
+
+        checkBox, widget = self.optionWidgets[spec.flag]
+        return (checkBox.isChecked(),
+            self.optionValue(spec) if widget is not None else None)
+
+    def setOptionValue(self, spec, widget, value):
+
+        if spec.kind == 'choice':
+            widget.setCurrentIndex(spec.values.index(value))
+        elif spec.kind == 'int':
+            widget.setValue(int(value))
+        elif spec.kind == 'float':
+            widget.setValue(float(value))
+        elif spec.kind == 'color':
+            self.optionColors[spec.flag] = re.sub('^0x', '#', value)
+
+    def optionValue(self, spec):
+
+        widget = self.optionWidgets[spec.flag][1]
+
+        if spec.kind == 'choice':
+            return spec.values[widget.currentIndex()]
+        elif spec.kind in ('int', 'float'):
+            return str(widget.value())
+        elif spec.kind == 'color':
+            return re.sub('^#', '0x', self.optionColors[spec.flag])
+
+        return None
+
+    def readConfig(self, confFl):
+
+        # Keep the whole document so that saving it preserves the comments
+        # and unknown lines
+        with span('readConfig'):
+            self.wbarDocument = ConfigDocument.read(confFl)
+
+        return self.wbarDocument.barSettings(), self.wbarDocument.icons()
+
+    def saveConfig(self):
+
+        with span('saveConfig'):
+            # The values of the tabs not opened yet are still needed
+            self.ensureTabs()
+
+            # Dock background image, preferences and effects, font path and
+            # size
+            barSettings = BarSettings.fromBlock(IconEntry(
+                self.barImageEdit.text(), self.getCommand(),
+                self.getFontLine()))
+
+            # Only the changed blocks are rewritten, and the file is left
+            # alone (mtime included) if nothing changed.
+            changed = self.wbarDocument.save(self.wbarFile, barSettings,
+                self.listIcons, self.backups)
+
+            if changed and self.applyLiveCheckBox.isChecked():
+                self.reloadWbar(barSettings.command)
+            elif changed:
+                self.statusBar.showMessage("Saved in '%s'. " % self.wbarFile
+                    + "Right-click on wbar to reload." , self.timeout)
+            else:
+                self.statusBar.showMessage("No changes to save in '%s'." 
+                    % self.wbarFile, self.timeout)
+
+    def reloadWbar(self, command):
+
+        try:
+            reloaded = self.reloader.reload(command, self.wbarFile)
+        except OSError as err:
+            # A slot of the apply timer, the error must not escape
+            self.statusBar.showMessage("Saved in '%s'. " % self.wbarFile
+                + "Cannot start wbar: %s." % (err.strerror or err),
+                self.timeout)
+            return
+
+        if reloaded:
+            self.statusBar.showMessage("Saved in '%s'. " % self.wbarFile
+                + "Reloaded wbar.", self.timeout)
+        else:
+            self.statusBar.showMessage("Saved in '%s'. " % self.wbarFile
+                + "wbar is not running.", self.timeout)
+
+    # Preferences and Effects
+    def getCommand(self):
+        return self.currentCommand().cmd
+
+    def currentCommand(self):
+        """The command line of the config with the options edited in the
+        tabs set or unset. The tokens the dialog does not know and the
+        options not edited, even if their widget could not show the value,
+        are kept as they are."""
+
+        command = WbarCommand(self.wbarCommand.cmd)
+        for spec in OPTION_SCHEMA:
+            if spec.flag not in self.optionWidgets:
+                continue
+
+            state = self.optionState(spec)
+            if state == self.loadedOptions.get(spec.flag):
+                continue
+
+            if state[0]:
+                command.set(spec.flag, state[1])
+            else:
+                command.unset(spec.flag)
+
+        return command
+
+    def currentOptions(self):
+        return optionValues(self.currentCommand())
+
+    def fontState(self):
+        return self.fontPathEdit.text(), self.fontSizeSpinBox.value()
+
+    def getFontLine(self):
+
+        # The 't:' line of the config, unless the font was edited
+        if self.loadedFont is not None and self.fontState() == self.loadedFont:
+            return self.barSettings.fontLine()
+
+        return self.getFontPathSize()
+
+    def getFontPathSize(self):
+        
+        fntPthSz = os.path.join(
+            stripFontExt(self.fontPathEdit.text(), self.fontExts), 
+            str(self.fontSizeSpinBox.value()))
+
+        return fntPthSz
+
+    def _createTabWidgets(self):
+        
+        self.tabs = QTabWidget()
+        self.vbox.addWidget(self.tabs)
+
+        # index -> function filling in the page of a tab not built yet
+        self.lazyTabs = {}
+        self.preferencesWidget = None
+        self.effectsWidget = None
+        self.tabs.currentChanged.connect(self.ensureTab)
+
+    def _addLazyTab(self, title, create):
+
+        index = self.tabs.addTab(QWidget(), title)
+        self.lazyTabs[index] = create
+
+    def ensureTab(self, index):
+
+        create = self.lazyTabs.pop(index, None)
+        if create is None:
+            return
+
+        page = self.tabs.widget(index)
+        create(page)
+
+        if self.configRead:
+            self.updateTab(page)
+
+        # After the update, so that filling in the values is no edit
+        self._connectLiveApply(page)
+
+    def ensureTabs(self):
+
+        for index in list(self.lazyTabs):
+            self.ensureTab(index)
+
+    def updateTab(self, page):
+
+        if page is self.preferencesWidget:
+            self.updateWbarConfig()
+            self.updatePreferences()
+        elif page is self.effectsWidget:
+            self.updateEffects()
+
+    def _createIconsTab(self):
+        
+        self.iconsWidget = QWidget()
+        self.tabs.addTab(self.iconsWidget, "Icons")
+
+        self.iconsVBox = QVBoxLayout()
+        self.iconsWidget.setLayout(self.iconsVBox)
+
+        self._createIconsHBox()
+        self._createIconsTable()
+
+    def _createIconsHBox(self):
+        
+        iconsHBox = QHBoxLayout()
+        self.iconsVBox.addLayout(iconsHBox)
+
+        self.addIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "document-new.png")), "")
+        self.addIconBtn.setFixedSize(24,24)
+        self.addIconBtn.setToolTip("Add Icons")
+        self.addIconBtn.clicked.connect(self.addIconBtnClicked)        
+        iconsHBox.addWidget(self.addIconBtn)
+
+        self.importIconsBtn = QPushButton(QIcon.fromTheme('document-import',
+            QIcon(os.path.join(self.icon_dir, "document-new.png"))), "")
+        self.importIconsBtn.setFixedSize(24,24)
+        self.importIconsBtn.setToolTip("Import from applications")
+        self.importIconsBtn.clicked.connect(self.importIconsBtnClicked)
+        iconsHBox.addWidget(self.importIconsBtn)
+
+        self.editIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "gtk-edit.png")), "")
+        self.editIconBtn.setFixedSize(24,24)
+        self.editIconBtn.setToolTip("Edit Icons")
+        self.editIconBtn.clicked.connect(self.editIconBtnClicked)        
+        iconsHBox.addWidget(self.editIconBtn)
+
+        self.delIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "gtk-close.png")), "")
+        self.delIconBtn.setFixedSize(24,24)
+        self.delIconBtn.setToolTip("Delete Icons")
+        self.delIconBtn.clicked.connect(self.delIconBtnClicked)        
+        iconsHBox.addWidget(self.delIconBtn)
+
+        iconsHBox.addWidget(VLine())
+
+        self.topIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "go-top.png")), "")
+        self.topIconBtn.setFixedSize(24,24)
+        self.topIconBtn.setToolTip("Move icons to the top")
+        self.topIconBtn.clicked.connect(self.topIconBtnClicked)        
+        iconsHBox.addWidget(self.topIconBtn)
+
+        self.upIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "go-up.png")), "")
+        self.upIconBtn.setFixedSize(24,24)
+        self.upIconBtn.setToolTip("Move icons up")
+        self.upIconBtn.clicked.connect(self.upIconBtnClicked)        
+        iconsHBox.addWidget(self.upIconBtn)
+
+        self.downIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "go-down.png")), "")
+        self.downIconBtn.setFixedSize(24,24)
+        self.downIconBtn.setToolTip("Move icons down")
+        self.downIconBtn.clicked.connect(self.downIconBtnClicked)        
+        iconsHBox.addWidget(self.downIconBtn)
+
+        self.bottomIconBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "go-bottom.png")), "")
+        self.bottomIconBtn.setFixedSize(24,24)
+        self.bottomIconBtn.setToolTip("Move icons to the bottom")
+        self.bottomIconBtn.clicked.connect(self.bottomIconBtnClicked)        
+        iconsHBox.addWidget(self.bottomIconBtn)
+
+        iconsHBox.addWidget(VLine())
+
+        # Undo and redo of the icon list edits
+        self.undoStack = QUndoStack(self)
+
+        self.undoAction = self.undoStack.createUndoAction(self)
+        self.undoAction.setShortcut(QKeySequence('Ctrl+Z'))
+        self.addAction(self.undoAction)
+
+        self.redoAction = self.undoStack.createRedoAction(self)
+        self.redoAction.setShortcut(QKeySequence('Ctrl+Shift+Z'))
+        self.addAction(self.redoAction)
+
+        self.undoIconBtn = QPushButton(QIcon.fromTheme('edit-undo'), "")
+        self.undoIconBtn.setFixedSize(24,24)
+        self.undoIconBtn.setToolTip("Undo (Ctrl+Z)")
+        self.undoIconBtn.setEnabled(False)
+        self.undoIconBtn.clicked.connect(self.undoStack.undo)
+        self.undoStack.canUndoChanged.connect(self.undoIconBtn.setEnabled)
+        iconsHBox.addWidget(self.undoIconBtn)
+
+        self.redoIconBtn = QPushButton(QIcon.fromTheme('edit-redo'), "")
+        self.redoIconBtn.setFixedSize(24,24)
+        self.redoIconBtn.setToolTip("Redo (Ctrl+Shift+Z)")
+        self.redoIconBtn.setEnabled(False)
+        self.redoIconBtn.clicked.connect(self.undoStack.redo)
+        self.undoStack.canRedoChanged.connect(self.redoIconBtn.setEnabled)
+        iconsHBox.addWidget(self.redoIconBtn)
+
+        iconsHBox.addStretch()
+
+        # Filter on the title and command, Ctrl+F to get there
+        self.filterEdit = QLineEdit()
+        self.filterEdit.setPlaceholderText("Filter")
+        self.filterEdit.setToolTip("Show the icons whose title or command "
+            + "contains the text (Ctrl+F)")
+        self.filterEdit.setClearButtonEnabled(True)
+        self.filterEdit.setMaximumWidth(160)
+        self.filterEdit.textChanged.connect(self.filterIcons)
+        iconsHBox.addWidget(self.filterEdit)
+
+        self.filterAction = QAction(self)
+        self.filterAction.setShortcut(QKeySequence('Ctrl+F'))
+        self.filterAction.triggered.connect(self.filterEdit.setFocus)
+        self.addAction(self.filterAction)
+
+    def _createIconsTable(self):
+
+        self.iconModel = IconTableModel(self.listIcons)
+        self.iconModel.undoStack = self.undoStack
+        self.iconDelegate = IconDelegate()
+
+        # The view shows the model through the filter, the rows of the
+        # dialog methods are rows of the model (and of listIcons)
+        self.iconProxy = IconFilterProxy(self)
+        self.iconProxy.setSourceModel(self.iconModel)
+
+        self.iconTable = QTableView()
+        self.iconTable.setModel(self.iconProxy)
+        self.iconTable.setItemDelegateForColumn(0, self.iconDelegate)
+        self.iconDelegate.attach(self.iconTable)
+
+        header = self.iconTable.horizontalHeader()
+        
+        # Resize the 1st column
+        header.resizeSection(0, 48)
+        
+        # Stretch the last column to fit the window
+        header.setStretchLastSection(True)
+        
+        # Hide the row number
+        self.iconTable.verticalHeader().setVisible(False)
+
+        # Select the whole row when instead of a single cell, several rows
+        # with Shift and Ctrl
+        self.iconTable.setSelectionBehavior(QTableView.SelectRows)
+        self.iconTable.setSelectionMode(QTableView.ExtendedSelection)
+
+        # Reorder the rows by drag and drop
+        self.iconTable.setDragDropMode(QTableView.InternalMove)
+        self.iconTable.setDefaultDropAction(Qt.MoveAction)
+        self.iconTable.setDragDropOverwriteMode(False)
+        self.iconTable.setDropIndicatorShown(True)
+
+        # Do not highlight the headers
+        self.iconTable.horizontalHeader().setHighlightSections(False)
+
+        # Add the table view to the vertical layout
+        self.iconsVBox.addWidget(self.iconTable)
+
+    def filterIcons(self, text):
+
+        self.iconProxy.setFilterText(text)
+
+        # Reordering a filtered list by drag and drop would be guesswork
+        self.iconTable.setDragEnabled(not text)
+
+    def currentRow(self):
+
+        index = self.iconTable.currentIndex()
+        return self.iconProxy.mapToSource(index).row()
+
+    def selectedRows(self):
+
+        rows = [self.iconProxy.mapToSource(index).row() for index in
+            self.iconTable.selectionModel().selectedRows()]
+
+        # Fall back to the current row, e.g. for a row selected in code
+        if not rows and self.currentRow() >= 0:
+            rows = [self.currentRow()]
+
+        return sorted(rows)
+
+    def selectRows(self, first, last):
+
+        if first < 0 or last < first:
+            return
+
+        # The rows hidden by the filter are left out
+        model = self.iconModel
+        selection = self.iconProxy.mapSelectionFromSource(QItemSelection(
+            model.index(first, 0), model.index(last, model.columnCount() - 1)))
+        selectionModel = self.iconTable.selectionModel()
+        selectionModel.select(selection, QItemSelectionModel.ClearAndSelect)
+        selectionModel.setCurrentIndex(
+            self.iconProxy.mapFromSource(model.index(first, 0)),
+            QItemSelectionModel.NoUpdate)
+
+    def updateTable(self):
+
+        # Hand the whole list over to the model, the view only paints the
+        # visible rows. Single edits go through the undo commands instead.
+        with span('updateTable'):
+            self.iconModel.setIcons(self.listIcons)
+
+        # The rows of the commands refer to the previous list
+        self.undoStack.clear()
+
+    def iconThemeIndex(self):
+
+        if self.themeIndex is None:
+            self.themeIndex = IconThemeIndex()
+
+        return self.themeIndex
+
+    def currentIconSize(self):
+
+        # The Effects tab, once built, has the size not saved yet
+        return int(self.currentOptions().get('--isize') or
+            OPTIONS['--isize'].default)
+
+    def addIconBtnClicked(self):
+
+        dlg = SelectIcon(self.window_icon_path, None, self.iconThemeIndex(),
+            self.currentIconSize())
+        
+        if dlg.exec_() == SelectIcon.Accepted:
+            iconEntry = dlg.get_output()
+            n = len(self.listIcons)
+            self.undoStack.push(InsertIconCommand(self.iconModel, n,
+                iconEntry))
+            self.selectRows(n, n)
+
+    def importIconsBtnClicked(self):
+
+        # Kept for the session, the second time only the mtimes are checked
+        if self.appIndex is None:
+            self.appIndex = ApplicationIndex()
+
+        dlg = ApplicationsDialog(self.window_icon_path, self.appIndex,
+            self.iconThemeIndex(), self.currentIconSize(), self)
+
+        if dlg.exec_() == ApplicationsDialog.Accepted:
+            entries = dlg.get_output()
+            if entries:
+                n = len(self.listIcons)
+                self.undoStack.push(AddIconsCommand(self.iconModel, n,
+                    entries))
+                self.selectRows(n, n + len(entries) - 1)
+
+    def editIconBtnClicked(self):
+
+        row = self.currentRow()
+        
+        if row >= 0:
+            
+            inputIcon = self.listIcons[row] 
+            dlg = SelectIcon(self.window_icon_path, inputIcon,
+                self.iconThemeIndex(), self.currentIconSize())
+
+            if dlg.exec_() == SelectIcon.Accepted:
+                iconEntry = dlg.get_output()
+
+                # Replace the row with the updated entry
+                self.undoStack.push(ReplaceIconCommand(self.iconModel, row,
+                    iconEntry))
+                self.selectRows(row, row)
+        
+    def delIconBtnClicked(self):
+        
+        rows = self.selectedRows()
+        n = len(self.listIcons)
+        
+        if not rows or self.delConfirmation(rows) != QMessageBox.Ok:
+            return
+
+        if len(rows) == 1:
+            self.undoStack.push(RemoveIconCommand(self.iconModel, rows[0]))
+        else:
+            self.undoStack.push(RemoveIconsCommand(self.iconModel, rows))
+
+        # Select the row that took the place of the first one deleted, or
+        # the last row if the deleted ones were at the end
+        row = min(rows[0], n - len(rows) - 1)
+        self.selectRows(row, row)
+
+    def delConfirmation(self, rows):
+
+        if len(rows) == 1:
+            text = ("Delete the icon titled <b>'%s'</b>?" 
+                % self.listIcons[rows[0]].title)
+        else:
+            text = "Delete the <b>%d</b> selected icons?" % len(rows)
+
+        delDlg = QMessageBox()
+        delDlg.setWindowIcon(QIcon(self.window_icon_path))
+        delDlg.setIcon(QMessageBox.Warning)
+        delDlg.setWindowTitle("Delete icon?")
+        delDlg.setText(text)
+#         delDlg.setInformativeText("Your changes will be lost if you" 
+#             + " delete it.")
+        delDlg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+
+        rtn = delDlg.exec_()
+        return rtn
+
+    def moveIcons(self, rows, dest):
+
+        # The selected rows as one block at position dest of the others
+        command = MoveIconsCommand(self.iconModel, rows, dest)
+        if rows and not command.isNoop():
+            self.undoStack.push(command)
+            self.selectRows(dest, dest + len(rows) - 1)
+
+    def moveIcon(self, row, dest):
+
+        # Change only if a row is selected and it actually moves
+        if row >= 0 and row != dest:
+            self.undoStack.push(MoveIconCommand(self.iconModel, row, dest))
+            self.selectRows(dest, dest)
+
+    def topIconBtnClicked(self):
+        
+        self.moveIcons(self.selectedRows(), 0)
+
+    def upIconBtnClicked(self):
+
+        row = self.currentRow()
+        self.moveIcon(row, max(row-1, 0))
+
+    def downIconBtnClicked(self):
+
+        row = self.currentRow()
+        n = len(self.listIcons)
+        self.moveIcon(row, min(row+1, n-1))
+
+    def bottomIconBtnClicked(self):
+
+        rows = self.selectedRows()
+        self.moveIcons(rows, len(self.listIcons) - len(rows))
+
+    def _createPreferencesTab(self, preferencesWidget):
+        
+        self.preferencesWidget = preferencesWidget
+
+        vBoxLayout = QVBoxLayout()
+        preferencesWidget.setLayout(vBoxLayout)
+
+        # Font
+        fontHBox = QHBoxLayout()
+
+        fontSelectBtn = QPushButton('Font')
+        fontSelectBtn.setToolTip('Select font')
+        fontSelectBtn.clicked.connect(self.fontSelectBtnClicked)
+        fontHBox.addWidget(fontSelectBtn)
+
+        self.fontPathEdit = QLineEdit()
+        self.fontPathEdit.setToolTip('Font path')
+        self.fontPathEdit.setText(self.fontPathDefault)
+        fontHBox.addWidget(self.fontPathEdit)
+        
+        self.fontSizeSpinBox = QSpinBox()
+        self.fontSizeSpinBox.setToolTip('Font size')
+        self.fontSizeSpinBox.setRange(self.fontSizeMin, self.fontSizeMax)
+        self.fontSizeSpinBox.setValue(self.fontSizeDefault)
+        fontHBox.addWidget(self.fontSizeSpinBox)
+
+        vBoxLayout.addLayout(fontHBox)
+        # Font
+
+        # Dock background image
+        barImageHBox = QHBoxLayout()
+        
+        barImageBtn = QPushButton('Bar Image')
+        barImageBtn.setToolTip('Select dock background image')
+        barImageBtn.clicked.connect(self.barImageBtnClicked)
+        barImageHBox.addWidget(barImageBtn)
+
+        self.barImageEdit = QLineEdit()
+        self.barImageEdit.setToolTip('Dock background image')
+        self.barImageEdit.setText(self.barImageDefault)
+        self.barImageEdit.textChanged.connect(self.updateDockPreview)
+        barImageHBox.addWidget(self.barImageEdit)
+
+        vBoxLayout.addLayout(barImageHBox)
+        # Dock background image
+
+        vBoxLayout.addWidget(HLine())
+
+        self._createOptionWidgets('Preferences', vBoxLayout)
+
+        vBoxLayout.addStretch()
+
+    def fontSelectBtnClicked(self):
+        
+        fontFile = self.fontPathEdit.text()
+        fontSize = self.fontSizeSpinBox.value()
+        
+        fontDialog = FontDialogPreview(fontFile, fontSize, 
+            self.fontSizeMin, self.fontSizeMax, self.fontCatalog)
+        fontDialog.setWindowTitle('Select font')
+        fontDialog.setFileMode(QFileDialog.ExistingFile)
+        fontDialog.setDirectory(self.fontSearchPath)
+        fontDialog.selectFile(fontFile)
+        fontFilter = ('Font Files (' 
+            + ' '.join(['*' + ext for ext in self.fontExts])
+            + ')')
+        fontDialog.setNameFilters([fontFilter])
+#         fontDialog.setNameFilters(['Font Files (*.ttf *.otf)'])
+
+        if fontDialog.exec_() == FontDialogPreview.Accepted:
+            font, fontPath = fontDialog.getFont()
+            self.fontPathEdit.setText(fontPath)
+            self.fontSizeSpinBox.setValue(font.pointSize())
+
+    def barImageBtnClicked(self):
+
+        currentImage = self.barImageEdit.text()
+        
+        imageSelectDialog = ImageDialogPreview(currentImage)
+        imageSelectDialog.setWindowTitle('Select Image')
+        imageSelectDialog.setDirectory(self.imageDirecDefault)
+        imageSelectDialog.setNameFilters(["Image Files (*.png *.jpg *.jpeg)"])
+        imageSelectDialog.setFileMode(QFileDialog.ExistingFile)
+
+        if currentImage and os.path.exists(currentImage):
+            imageSelectDialog.selectFile(currentImage)
+
+        if imageSelectDialog.exec_() == ImageDialogPreview.Accepted:
+            path = imageSelectDialog.getFileSelected()
+            self.barImageEdit.setText(path)
+
+    def _createEffectsTab(self, effectsWidget):
+
+        self.effectsWidget = effectsWidget
+
+        vboxEffectsLayout = QVBoxLayout()
+        effectsWidget.setLayout(vboxEffectsLayout)
+
+        self._createOptionWidgets('Effects', vboxEffectsLayout)
+
+        # The dock as wbar would draw it with the options of the dialog
+        self.dockPreview = DockPreview()
+        self.dockPreview.setToolTip('Preview, move the mouse over the icons '
+            + 'and click them')
+        previewArea = QScrollArea()
+        previewArea.setWidget(self.dockPreview)
+        previewArea.setWidgetResizable(True)
+        vboxEffectsLayout.addWidget(previewArea, 1)
+
+        for signal in (self.iconModel.modelReset, self.iconModel.rowsInserted,
+                self.iconModel.rowsRemoved, self.iconModel.rowsMoved,
+                self.iconModel.layoutChanged, self.iconModel.dataChanged):
+            signal.connect(self.updateDockIcons)
+
+        self.updateDockIcons()
+        self.updateDockPreview()
+
+    def _createOptionWidgets(self, tab, layout):
+
+        for spec in OPTION_SCHEMA:
+            if spec.tab != tab:
+                continue
+
+            checkBox = QCheckBox(spec.label, self)
+            checkBox.setChecked(spec.checked)
+            checkBox.stateChanged.connect(self.updateDockPreview)
+
+            if spec.kind == 'flag':
+                self.optionWidgets[spec.flag] = (checkBox, None)
+                layout.addWidget(checkBox)
+                continue
+
+            widget = self._createValueWidget(spec)
+            self.optionWidgets[spec.flag] = (checkBox, widget)
+            self.optionToggled(spec.flag)
+            checkBox.stateChanged.connect(partial(self.optionToggled,
+                spec.flag))
+
+            if spec.kind == 'choice':
+                widget.currentIndexChanged.connect(self.updateDockPreview)
+            elif spec.kind in ('int', 'float'):
+                widget.valueChanged.connect(self.updateDockPreview)
+
+            hbox = QHBoxLayout()
+            hbox.addWidget(checkBox)
+            if spec.kind == 'choice':
+                hbox.addStretch()
+            hbox.addWidget(widget)
+            layout.addLayout(hbox)
+
+    def _createValueWidget(self, spec):
+
+        if spec.kind == 'choice':
+            widget = QComboBox()
+            widget.addItems(spec.values.labels)
+            widget.setCurrentIndex(spec.values.index(spec.default))
+            widget.setFixedSize(self.widgetWidth, self.widgetHeight)
+
+        elif spec.kind == 'color':
+            widget = QPushButton("")
+            widget.setFixedSize(self.widgetWidth, self.widgetHeight)
+            widget.clicked.connect(partial(self.colorBtnClicked, spec.flag))
+            self.optionColors[spec.flag] = re.sub('^0x', '#', spec.default)
+
+        else:
+            if spec.kind == 'float':
+                widget = QDoubleSpinBox()
+                widget.setSingleStep(0.1)
+                widget.setDecimals(1)
+            else:
+                widget = QSpinBox()
+            widget.setRange(*spec.values)
+            widget.setMaximumWidth(self.widgetWidth)
+            widget.setValue(spec.default)
+
+        return widget
+
+    def optionToggled(self, flag, *args):
+
+        checkBox, widget = self.optionWidgets[flag]
+        widget.setEnabled(checkBox.isChecked())
+
+        if flag in self.optionColors:
+            color = self.optionColors[flag] if checkBox.isChecked() \
+                else self.lightGray
+            widget.setStyleSheet('background-color: %s' % color)
+
+    def colorBtnClicked(self, flag):
+
+        colorDialog = QColorDialog()
+        color = colorDialog.getColor(options = QColorDialog.ShowAlphaChannel)
+
+        if color.isValid():
+            self.optionColors[flag] = color.name(QColor.HexArgb)
+            self.optionToggled(flag)
+            self.updateDockPreview()
+            self.scheduleApply()
+
+    def updateDockIcons(self, *args):
+
+        if self.dockPreview is not None:
+            self.dockPreview.setIcons(self.listIcons)
+
+    def updateDockPreview(self, *args):
+
+        if self.dockPreview is None:
+            return
+
+        barImage = self.barImageEdit.text() if self.preferencesWidget \
+            is not None else self.barSettings.image
+        self.dockPreview.setBarImage(barImage)
+        self.dockPreview.setOptions(self.currentOptions())
+
+    def _createButtons(self):
+        
+        hboxButtons = QHBoxLayout()
+
+        self.applyLiveCheckBox = QCheckBox('Apply live')
+        self.applyLiveCheckBox.setToolTip('Save and reload wbar after '
+            + 'every change')
+        self.applyLiveCheckBox.stateChanged.connect(self.scheduleApply)
+        hboxButtons.addWidget(self.applyLiveCheckBox)
+
+        hboxButtons.addStretch()
+
+        self.aboutBtn = QPushButton(QIcon.fromTheme('help-about',
+            QIcon(os.path.join(self.icon_dir, "about.png"))), "About")
+        self.aboutBtn.clicked.connect(self.aboutBtnClicked)
+        hboxButtons.addWidget(self.aboutBtn)
+
+        self.closeBtn = QPushButton(QIcon.fromTheme('window-close', 
+            QIcon(os.path.join(self.icon_dir, "application-exit"))), "Close")
+        self.closeBtn.clicked.connect(self.close)
+        hboxButtons.addWidget(self.closeBtn)
+
+        self.saveBtn = QPushButton(QIcon(os.path.join(self.icon_dir, 
+            "document-save.png")), "Save")
+        self.saveBtn.clicked.connect(self.saveConfig)
+        hboxButtons.addWidget(self.saveBtn)
+
+        self.vbox.addLayout(hboxButtons)
+
+    def aboutBtnClicked(self):
+        QMessageBox.about(self, "About %s" % self.window_title,
+            "<p>The <b>%s</b> is an editor " % self.window_title 
+            + "for the wbar dock.</p>")
+
+    # Re-define closeEvent function to save the file before closing the window
+    def closeEvent(self, event):
+        self.settings.setValue('windowSize', self.size())
+        self.settings.setValue('windowPosition', self.pos()) 
+        if self.themeIndex is not None:
+            self.themeIndex.save()
+
+    def _createStatusBar(self):
+        self.statusBar = QStatusBar()
+        self.vbox.addWidget(self.statusBar)
+
+        if self.debug:
+            # Thumbnail cache counters, refreshed every second
+            self.cacheStatsLabel = QLabel()
+            self.statusBar.addPermanentWidget(self.cacheStatsLabel)
+
+            self.cacheStatsTimer = QTimer(self)
+            self.cacheStatsTimer.timeout.connect(self.updateCacheStats)
+            self.cacheStatsTimer.start(1000)
+
+        if self.profile:
+            # The last phase timed, all of them in the tool tip
+            self.profileLabel = QLabel()
+            self.statusBar.addPermanentWidget(self.profileLabel)
+            tracer.listeners.append(self.showSpan)
+
+    def updateCacheStats(self):
+        self.cacheStatsLabel.setText(sharedCache().stats())
+
+    def showSpan(self, name, seconds):
+
+        self.profileLabel.setText('%s: %.1f ms' % (name, seconds * 1e3))
+        self.profileLabel.setToolTip('\n'.join('%s: %d x, %.1f ms' % (n,
+            count, total * 1e3) for n, (count, total) in
+            sorted(tracer.totals().items())))
+
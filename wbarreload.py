@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+import os
+import time
+import signal
+import subprocess
+
+from wbarconfig import WbarCommand
+
+
+def findProcesses(name, uid = None):
+    """Return the pids of the processes called 'name' that belong to uid
+    (the current user by default), by scanning /proc."""
+
+    if uid is None:
+        uid = os.getuid()
+
+    # The name in /proc/<pid>/stat is cut to 15 characters
+    comm = name[:15]
+    pids = []
+
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return pids
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+
+        procDir = os.path.join('/proc', entry)
+        try:
+            if os.stat(procDir).st_uid != uid:
+                continue
+
+            # '<pid> (<name>) <state> ...', the name may hold spaces
+            with open(os.path.join(procDir, 'stat'), 'r') as fh:
+                stat = fh.read()
+
+        except OSError:
+            # The process went away meanwhile
+            continue
+
+        start = stat.find('(')
+        end = stat.rfind(')')
+        state = stat[end+2:end+3]
+
+        # Skip zombies, they are already gone
+        if stat[start+1:end] != comm or state in ('Z', 'X'):
+            continue
+
+        pids.append(int(entry))
+
+    return pids
+
+
+class WbarReloader(object):
+    """Makes the running wbar pick up a saved config, either by sending it
+    a signal or by restarting it with the command of the config's 'c:'
+    line."""
+
+    # Seconds the old dock has to exit after SIGTERM, and then after
+    # SIGKILL, before the new one starts
+    exitTimeout = 1.0
+
+    def __init__(self, processName = 'wbar', reloadSignal = None):
+
+        self.processName = processName
+
+        # None restarts wbar, a signal number sends that signal instead
+        self.reloadSignal = reloadSignal
+        self._children = []
+
+    def running(self):
+        return findProcesses(self.processName)
+
+    def reload(self, command, wbarFile = None):
+        """Reload the running wbar. Return the pids signalled or the pid of
+        the restarted process, an empty list if wbar is not running. An
+        OSError is raised if the new dock cannot be started."""
+
+        pids = self.running()
+        if not pids:
+            return []
+
+        if self.reloadSignal is not None:
+            for pid in pids:
+                self._kill(pid, self.reloadSignal)
+            return pids
+
+        # Two docks must not run at once, the new one only starts once the
+        # old ones are gone
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            for pid in pids:
+                self._kill(pid, sig)
+            pids = self.waitExit(pids, self.exitTimeout)
+            if not pids:
+                break
+
+        return [self.start(command, wbarFile)]
+
+    def waitExit(self, pids, timeout):
+        """Wait up to timeout seconds for the processes to exit. Return the
+        pids still running."""
+
+        deadline = time.monotonic() + timeout
+        while True:
+            # Our own docks stay zombies until they are reaped
+            for proc in self._children:
+                proc.poll()
+
+            pids = set(pids).intersection(self.running())
+            if not pids or time.monotonic() >= deadline:
+                return sorted(pids)
+
+            time.sleep(0.02)
+
+    def start(self, command, wbarFile = None):
+
+        args = WbarCommand(command).tokens or [self.processName]
+
+        if wbarFile and '--config' not in args:
+            args += ['--config', wbarFile]
+
+        # Reap the docks started before which have exited since
+        self._children = [p for p in self._children if p.poll() is None]
+
+        proc = subprocess.Popen(args, stdin = subprocess.DEVNULL,
+            stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL,
+            start_new_session = True)
+        self._children.append(proc)
+
+        return proc.pid
+
+    @staticmethod
+    def _kill(pid, sig):
+
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Timings of the phases of the dialog. With --profile, or when the
+# WBAR_SETTINGS_TRACE environment variable names a file, spans are recorded
+# with perf_counter_ns and written at exit in the Chrome trace event format,
+# which chrome://tracing and https://ui.perfetto.dev open. Only the standard
+# library is used, so the launcher can turn tracing on before Qt is
+# imported. When tracing is off a span costs one attribute test.
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+
+TRACE_ENV = 'WBAR_SETTINGS_TRACE'
+
+# Written by --profile when the environment variable is not set
+DEFAULT_TRACE = 'wbar-settings-trace.json'
+
+
+class _Span(object):
+
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NoSpan(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_noSpan = _NoSpan()
+
+
+class Tracer(object):
+    """Collects complete ('X') trace events. The listeners are called with
+    the name and the seconds of every span that ends on the main thread,
+    e.g. to show it in the status bar."""
+
+    def __init__(self):
+
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self.listeners = []
+
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, path):
+
+        if not self.enabled:
+            atexit.register(self.dump)
+
+        self.enabled = True
+        self.path = path
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _noSpan
+
+    def record(self, name, start, end):
+
+        thread = threading.current_thread()
+        event = {'name': name, 'cat': 'wbar-settings', 'ph': 'X',
+            'ts': (start - self._origin) / 1e3, 'dur': (end - start) / 1e3,
+            'pid': os.getpid(), 'tid': thread.ident}
+
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+
+        if thread is threading.main_thread():
+            for listener in self.listeners:
+                listener(name, (end - start) / 1e9)
+
+    def totals(self):
+        """name -> (count, total seconds) of the spans recorded."""
+
+        totals = {}
+        with self._lock:
+            for event in self.events:
+                count, total = totals.get(event['name'], (0, 0.0))
+                totals[event['name']] = (count + 1, total + event['dur'] / 1e6)
+
+        return totals
+
+    def dump(self, path = None):
+
+        path = path or self.path
+        if not path:
+            return
+
+        with self._lock:
+            # Thread names, so that the workers get their own labelled rows
+            events = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(),
+                'tid': tid, 'args': {'name': name}}
+                for tid, name in self._threads.items()] + self.events
+
+        try:
+            with open(path, 'w') as fh:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'},
+                    fh)
+        except OSError as err:
+            sys.stderr.write('wbar-settings: cannot write the trace to %s: '
+                '%s\n' % (path, err.strerror))
+
+
+tracer = Tracer()
+
+if os.environ.get(TRACE_ENV):
+    tracer.enable(os.environ[TRACE_ENV])
+
+
+def span(name):
+    """A context manager timing its block as the span name."""
+
+    return tracer.span(name)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# Lisence: GPLv3 or later version.
+
+# Checks many wbar configs at once. The files are parsed on a process pool,
+# then every distinct icon, command and font is checked once however many
+# configs refer to it, and the results are merged into one report.
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from wbarconfig import (readConfig, WbarCommand, FontResolver, FONT_EXTS,
+    COMMAND_OPTIONS, checkOption)
+
+_readerClass = None
+
+
+def _imageReader(path):
+
+    # Imported in the worker, and only QtGui: decoding needs no display
+    global _readerClass
+    if _readerClass is None:
+        from PyQt5.QtGui import QImageReader
+        _readerClass = QImageReader
+
+    return _readerClass(path)
+
+
+def checkImage(path):
+    """Return why the image file cannot be used, or None."""
+
+    if not path:
+        return 'no icon given'
+
+    try:
+        st = os.stat(path)
+    except OSError as err:
+        return err.strerror.lower()
+
+    if not os.path.isfile(path):
+        return 'not a regular file'
+
+    if st.st_size == 0:
+        return 'empty file'
+
+    reader = _imageReader(path)
+    if reader.read().isNull():
+        return 'cannot decode: %s' % reader.errorString().lower()
+
+    return None
+
+
+def checkImages(paths):
+    return [checkImage(path) for path in paths]
+
+
+def scanConfig(confFl):
+    """Parse one config. Return (confFl, problems, icons, programs, font):
+    the option and read problems found on the way, the icon paths, the
+    (block, program) pairs of the c: lines and the t: font to resolve."""
+
+    try:
+        barSettings, listIcons = readConfig(confFl)
+    except (OSError, UnicodeDecodeError) as err:
+        message = getattr(err, 'strerror', None) or str(err)
+        return confFl, [problem('read', 0, confFl, message.lower())], [], \
+            [], None
+
+    problems = []
+    icons = []
+    programs = []
+    font = None
+
+    if barSettings is not None:
+        command = WbarCommand(barSettings.command)
+        programs.append((0, command.program))
+
+        for option, value in command.items():
+            message = checkOption(option, value)
+            if message:
+                problems.append(problem('option', 0, option, message,
+                    'warning' if option not in COMMAND_OPTIONS else 'error'))
+
+        if '--nofont' not in command:
+            font = barSettings.font
+
+        if barSettings.image:
+            icons.append((0, barSettings.image))
+
+    for block, entry in enumerate(listIcons, 1):
+        icons.append((block, entry.icon))
+        programs.append((block, WbarCommand(entry.command).program))
+
+    return confFl, problems, icons, programs, font
+
+
+def problem(kind, block, value, message, severity = 'error'):
+
+    # block 0 is the dock block, the launchers count from 1
+    return {'kind': kind, 'block': block, 'value': value,
+        'message': message, 'severity': severity}
+
+
+class Validator(object):
+    """Validates configs in parallel. The results for icons, commands and
+    fonts are kept across calls, so a path is checked once per run."""
+
+    def __init__(self, jobs = None, chunkSize = 16):
+
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunkSize = chunkSize
+        self.resolver = FontResolver(FONT_EXTS)
+
+        self.images = {}
+        self.programs = {}
+        self.fonts = {}
+
+    def _map(self, pool, func, items):
+
+        if pool is None:
+            return map(func, items)
+
+        return pool.map(func, items, chunksize = self.chunkSize)
+
+    def checkProgram(self, program):
+
+        if program not in self.programs:
+            if not program:
+                self.programs[program] = 'no command given'
+            elif shutil.which(program) is None:
+                self.programs[program] = 'not found on $PATH'
+            else:
+                self.programs[program] = None
+
+        return self.programs[program]
+
+    def checkFont(self, font):
+
+        if font not in self.fonts:
+            self.fonts[font] = None if self.resolver.candidates(font) else \
+                'no font file with the extensions %s' % ', '.join(FONT_EXTS)
+
+        return self.fonts[font]
+
+    def validate(self, files):
+        """Return the report for the config files as a dict ready to be
+        dumped as JSON."""
+
+        # A pool does not pay off for a single file
+        pool = ProcessPoolExecutor(self.jobs) if self.jobs > 1 and \
+            len(files) > 1 else None
+
+        try:
+            scans = list(self._map(pool, scanConfig, files))
+
+            # Every distinct image once, in chunks spread over the workers
+            paths = sorted(set(path for scan in scans for _, path in scan[2]
+                if path not in self.images))
+            chunks = [paths[i:i+self.chunkSize]
+                for i in range(0, len(paths), self.chunkSize)]
+            for chunk, results in zip(chunks, self._map(pool, checkImages,
+                    chunks)):
+                self.images.update(zip(chunk, results))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        reports = []
+        for confFl, problems, icons, programs, font in scans:
+            problems = list(problems)
+
+            for block, path in icons:
+                message = self.images[path]
+                if message:
+                    problems.append(problem('icon', block, path, message))
+
+            for block, program in programs:
+                message = self.checkProgram(program)
+                if message:
+                    problems.append(problem('command', block, program,
+                        message))
+
+            if font is not None:
+                message = self.checkFont(font)
+                if message:
+                    problems.append(problem('font', 0, font, message))
+
+            reports.append({'file': confFl, 'problems': problems,
+                'ok': not any(p['severity'] == 'error' for p in problems)})
+
+        return {
+            'ok': all(report['ok'] for report in reports),
+            'files': reports,
+            'checked': {'files': len(reports), 'icons': len(self.images),
+                'commands': len(self.programs), 'fonts': len(self.fonts)},
+        }